@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Access Log for Cosmic App Store download servers
+Writes JSON-lines request records from a background thread
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+class AccessLog:
+    """JSON-lines access log written by a background thread
+
+    log() only puts the record on a bounded queue; if the queue is full the
+    record is dropped and counted, so a slow disk never holds up a request.
+    The writer batches records into one write and rotates the file once it
+    passes max_bytes, keeping `backups` older files (access.log.1, ...).
+    With sample_rate below 1, only that fraction of successful requests is
+    logged; errors are always logged.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backups=5, queue_size=10000,
+                 batch_size=256, flush_interval=1.0, sample_rate=1.0):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.written = 0
+        self.file = None
+        self.thread = None
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self.run, name="access-log", daemon=True)
+        self.thread.start()
+        return self
+
+    def log(self, record):
+        status = record.get("status")
+        if self.sample_rate < 1 and not (isinstance(status, int) and status >= 400):
+            if random.random() >= self.sample_rate:
+                return
+        record.setdefault("time", datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [record]
+            while record is not None and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(record)
+            stop = None in batch
+            self.write([record for record in batch if record is not None])
+            if stop:
+                return
+
+    def write(self, records):
+        if not records:
+            return
+        try:
+            self.file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+            self.file.flush()
+            self.written += len(records)
+            if self.file.tell() >= self.max_bytes:
+                self.rotate()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Access log write failed: {e}", file=sys.stderr)
+
+    def rotate(self):
+        """Shift access.log -> access.log.1 -> ... and start a new file"""
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """Write out everything queued so far and stop the writer"""
+        if self.thread is None:
+            return
+        # Blocking put: the stop marker must not be dropped
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        self.file.close()
+
+def request_record(handler, status, nbytes=None, seconds=None):
+    """Access log record for a request handled by an http.server handler"""
+    record = {
+        "client": handler.client_address[0],
+        "method": getattr(handler, "command", None),
+        "path": getattr(handler, "path", None),
+        "status": int(status) if status is not None else None,
+    }
+    if nbytes is not None:
+        record["bytes"] = nbytes
+    if seconds is not None:
+        record["ms"] = round(seconds * 1000, 3)
+    if getattr(handler, "headers", None) is not None:
+        for header, key in (("User-Agent", "user_agent"), ("Referer", "referer")):
+            if handler.headers.get(header):
+                record[key] = handler.headers[header]
+    return record
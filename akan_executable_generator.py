@@ -4,13 +4,14 @@ Akan Wise Saying - Executable Generator
 Creates real executable files for the Akan Wise Saying app
 """
 
-import os
 import sys
 import json
-import zipfile
 import subprocess
 from pathlib import Path
-import shutil
+
+from build_orchestrator import BuildOrchestrator, npm_install_steps, record_npm_install
+from build_profiler import profiled, record_write, report_if_requested
+from bundle_writer import BundleWriter, copy_atomic, write_atomic
 
 class AkanExecutableGenerator:
     def __init__(self):
@@ -20,6 +21,7 @@ class AkanExecutableGenerator:
         self.downloads_dir = Path("downloads")
         self.akan_dir = Path("akan-wise-saying-app")
         
+    @profiled
     def create_app_structure(self):
         """Create the Akan Wise Saying app structure"""
         print(f"🚀 Creating {self.app_name} app structure...")
@@ -37,6 +39,7 @@ class AkanExecutableGenerator:
         
         print(f"✅ Created {self.app_name} app structure")
         
+    @profiled
     def create_package_json(self):
         """Create package.json for Electron app"""
         package_data = {
@@ -84,7 +87,9 @@ class AkanExecutableGenerator:
         
         with open(self.akan_dir / "package.json", "w") as f:
             json.dump(package_data, f, indent=2)
+        record_write(self.akan_dir / "package.json")
             
+    @profiled
     def create_main_js(self):
         """Create main.js for Electron app"""
         main_js_content = '''const { app, BrowserWindow, Menu } = require('electron');
@@ -183,7 +188,9 @@ Menu.setApplicationMenu(menu);
         
         with open(self.akan_dir / "main.js", "w") as f:
             f.write(main_js_content)
+        record_write(self.akan_dir / "main.js")
             
+    @profiled
     def create_index_html(self):
         """Create the main HTML file for the Akan Wise Saying app"""
         html_content = '''<!DOCTYPE html>
@@ -260,7 +267,9 @@ Menu.setApplicationMenu(menu);
         
         with open(self.akan_dir / "index.html", "w") as f:
             f.write(html_content)
+        record_write(self.akan_dir / "index.html")
             
+    @profiled
     def create_styles_css(self):
         """Create the CSS styles for the app"""
         css_content = '''/* Cosmic Theme for Akan Wise Saying */
@@ -570,7 +579,9 @@ body {
         
         with open(self.akan_dir / "styles.css", "w") as f:
             f.write(css_content)
+        record_write(self.akan_dir / "styles.css")
             
+    @profiled
     def create_app_js(self):
         """Create the JavaScript functionality for the app"""
         js_content = '''// Akan Wise Saying App JavaScript
@@ -872,7 +883,9 @@ document.addEventListener('mousemove', (e) => {
         
         with open(self.akan_dir / "app.js", "w") as f:
             f.write(js_content)
+        record_write(self.akan_dir / "app.js")
             
+    @profiled
     def create_manifest_json(self):
         """Create manifest.json for PWA support"""
         manifest_content = {
@@ -899,7 +912,9 @@ document.addEventListener('mousemove', (e) => {
         
         with open(self.akan_dir / "manifest.json", "w") as f:
             json.dump(manifest_content, f, indent=2)
+        record_write(self.akan_dir / "manifest.json")
             
+    @profiled
     def create_assets_directory(self):
         """Create assets directory with placeholder icons"""
         assets_dir = self.akan_dir / "assets"
@@ -922,14 +937,21 @@ document.addEventListener('mousemove', (e) => {
         
         with open(assets_dir / "icon.svg", "w") as f:
             f.write(svg_icon)
+        record_write(assets_dir / "icon.svg")
             
         # Create placeholder files for other icon formats
         for icon_name in ["icon.png", "icon.ico", "icon.icns", "icon-192.png", "icon-512.png"]:
             with open(assets_dir / icon_name, "w") as f:
                 f.write("# Placeholder icon file")
+            record_write(assets_dir / icon_name)
                 
-    def build_executables(self):
-        """Build actual executables using Electron"""
+    @profiled
+    def build_executables(self, max_parallel=None):
+        """Build actual executables using Electron
+
+        The Windows, macOS and Linux targets are independent, so after
+        npm install they run concurrently, up to max_parallel at a time.
+        """
         print(f"🔨 Building executables for {self.app_name}...")
         
         # Check if Node.js and npm are available
@@ -941,37 +963,28 @@ document.addEventListener('mousemove', (e) => {
             print("Please install Node.js from https://nodejs.org/")
             return False
             
-        # Navigate to app directory
-        os.chdir(self.akan_dir)
-        
-        try:
-            # Install dependencies
-            print("📦 Installing dependencies...")
-            subprocess.run(["npm", "install"], check=True)
-            
-            # Build executables
-            print("🔨 Building Windows executable...")
-            subprocess.run(["npm", "run", "build-win"], check=True)
-            
-            print("🔨 Building macOS app...")
-            subprocess.run(["npm", "run", "build-mac"], check=True)
-            
-            print("🔨 Building Linux AppImage...")
-            subprocess.run(["npm", "run", "build-linux"], check=True)
-            
-            # Copy executables to downloads directory
-            self.copy_executables()
-            
-            print("✅ Executables built successfully!")
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error building executables: {e}")
+        orchestrator = BuildOrchestrator(self.akan_dir, max_parallel=max_parallel)
+        built = orchestrator.run(
+            setup=npm_install_steps(self.akan_dir),
+            targets=[
+                ("win", ["npm", "run", "build-win"]),
+                ("mac", ["npm", "run", "build-mac"]),
+                ("linux", ["npm", "run", "build-linux"]),
+            ],
+        )
+        if orchestrator.succeeded("install"):
+            record_npm_install(self.akan_dir)
+        if not built:
+            print("❌ Error building executables")
             return False
-        finally:
-            # Return to original directory
-            os.chdir("..")
+        
+        # Copy executables to downloads directory
+        self.copy_executables()
+        
+        print("✅ Executables built successfully!")
+        return True
             
+    @profiled
     def copy_executables(self):
         """Copy built executables to downloads directory"""
         dist_dir = self.akan_dir / "dist"
@@ -984,21 +997,22 @@ document.addEventListener('mousemove', (e) => {
         # Copy Windows executable
         for file in dist_dir.glob("**/*.exe"):
             dest = self.downloads_dir / "windows" / f"{self.app_id}-windows.exe"
-            shutil.copy2(file, dest)
+            copy_atomic(file, dest)
             print(f"✅ Copied Windows executable: {dest}")
             
         # Copy macOS app
         for file in dist_dir.glob("**/*.dmg"):
             dest = self.downloads_dir / "mac" / f"{self.app_id}-mac.dmg"
-            shutil.copy2(file, dest)
+            copy_atomic(file, dest)
             print(f"✅ Copied macOS app: {dest}")
             
         # Copy Linux AppImage
         for file in dist_dir.glob("**/*.AppImage"):
             dest = self.downloads_dir / "linux" / f"{self.app_id}-linux.AppImage"
-            shutil.copy2(file, dest)
+            copy_atomic(file, dest)
             print(f"✅ Copied Linux AppImage: {dest}")
             
+    @profiled
     def create_simple_executables(self):
         """Create simple executable files as fallback"""
         print("📦 Creating simple executable files...")
@@ -1017,12 +1031,11 @@ echo.
 pause'''
         
         batch_file = self.downloads_dir / "windows" / f"{self.app_id}-windows.bat"
-        with open(batch_file, "w") as f:
-            f.write(batch_content)
+        write_atomic(batch_file, batch_content)
             
         # Create a simple executable-like file
         exe_file = self.downloads_dir / "windows" / f"{self.app_id}-windows.exe"
-        with zipfile.ZipFile(exe_file, "w") as zipf:
+        with BundleWriter(exe_file) as zipf:
             zipf.writestr("launcher.bat", batch_content)
             zipf.writestr("README.txt", f"""{self.app_name}
 
@@ -1036,6 +1049,7 @@ Created by Cosmos Coderr - Cosmic App Store
             
         print(f"✅ Created simple Windows executable: {exe_file}")
         
+    @profiled
     def run(self):
         """Run the complete build process"""
         print(f"🚀 Starting {self.app_name} executable generator...")
@@ -1056,4 +1070,5 @@ Created by Cosmos Coderr - Cosmic App Store
 
 if __name__ == "__main__":
     generator = AkanExecutableGenerator()
-    generator.run() 
\ No newline at end of file
+    generator.run()
+    report_if_requested() 
\ No newline at end of file
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Asyncio Download Server for Cosmic App Store
+Serves the downloads directory with one coroutine per connection
+"""
+
+import asyncio
+import html
+import mimetypes
+import os
+import posixpath
+import urllib.parse
+from email.utils import formatdate
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+# Request bodies up to this size are read and dropped to keep the connection;
+# larger ones close it instead
+MAX_DISCARDED_BODY = 1024 * 1024
+
+class AsyncDownloadServer:
+    def __init__(self, port=8000, downloads_dir="downloads", keep_alive_timeout=15):
+        self.port = port
+        self.downloads_dir = Path(downloads_dir)
+        self.keep_alive_timeout = keep_alive_timeout
+        self.server = None
+        self.loop = None
+        self.stop_event = None
+
+    def translate_path(self, url_path):
+        """Map a URL path onto the downloads directory (None if it escapes)"""
+        path = urllib.parse.unquote(url_path.split("?", 1)[0].split("#", 1)[0])
+        path = posixpath.normpath(path)
+        root = self.downloads_dir.resolve()
+        full = root.joinpath(*[part for part in path.split("/") if part and part not in (".", "..")])
+        try:
+            full.resolve().relative_to(root)
+        except ValueError:
+            return None
+        return full
+
+    def list_directory(self, directory, url_path):
+        """Render a directory listing in the same layout as SimpleHTTPRequestHandler"""
+        entries = sorted(os.listdir(directory), key=str.lower)
+        title = html.escape(f"Directory listing for {url_path}")
+        lines = [
+            "<!DOCTYPE HTML>",
+            '<html lang="en">',
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{title}</title>",
+            "</head>",
+            "<body>",
+            f"<h1>{title}</h1>",
+            "<hr>",
+            "<ul>",
+        ]
+        for name in entries:
+            display = name + "/" if (directory / name).is_dir() else name
+            lines.append(f'<li><a href="{urllib.parse.quote(display)}">{html.escape(display)}</a></li>')
+        lines += ["</ul>", "<hr>", "</body>", "</html>", ""]
+        return "\n".join(lines).encode("utf-8")
+
+    async def send_headers(self, writer, status, reason, headers):
+        head = [f"HTTP/1.1 {status} {reason}"]
+        head.append(f"Date: {formatdate(usegmt=True)}")
+        head += [f"{name}: {value}" for name, value in headers]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_error(self, writer, status, reason, keep_alive):
+        body = f"<h1>{status} {reason}</h1>\n".encode("utf-8")
+        await self.send_headers(writer, status, reason, [
+            ("Content-Type", "text/html; charset=utf-8"),
+            ("Content-Length", str(len(body))),
+            ("Connection", "keep-alive" if keep_alive else "close"),
+        ])
+        writer.write(body)
+        await writer.drain()
+
+    async def send_file(self, writer, full_path, method, keep_alive):
+        """Stream a file in chunks, reading off the event loop"""
+        size = full_path.stat().st_size
+        content_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+        await self.send_headers(writer, 200, "OK", [
+            ("Content-Type", content_type),
+            ("Content-Length", str(size)),
+            ("Last-Modified", formatdate(full_path.stat().st_mtime, usegmt=True)),
+            ("Connection", "keep-alive" if keep_alive else "close"),
+        ])
+        if method == "HEAD":
+            await writer.drain()
+            return
+        with open(full_path, "rb") as f:
+            while True:
+                chunk = await self.loop.run_in_executor(None, f.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+
+    async def handle_request(self, writer, method, target, keep_alive):
+        if method not in ("GET", "HEAD"):
+            await self.send_error(writer, 501, "Not Implemented", keep_alive)
+            return
+        parts = urllib.parse.urlsplit(target)
+        url_path = urllib.parse.unquote(parts.path)
+        if any(ord(ch) < 0x20 or ord(ch) == 0x7f for ch in url_path):
+            await self.send_error(writer, 400, "Bad Request", keep_alive)
+            return
+        full_path = self.translate_path(target)
+        if full_path is None or not full_path.exists():
+            await self.send_error(writer, 404, "Not Found", keep_alive)
+            return
+        if full_path.is_dir():
+            if not parts.path.endswith("/"):
+                location = urllib.parse.urlunsplit(("", "", parts.path + "/", parts.query, parts.fragment))
+                await self.send_headers(writer, 301, "Moved Permanently", [
+                    ("Location", location),
+                    ("Content-Length", "0"),
+                    ("Connection", "keep-alive" if keep_alive else "close"),
+                ])
+                await writer.drain()
+                return
+            index = full_path / "index.html"
+            if index.is_file():
+                await self.send_file(writer, index, method, keep_alive)
+                return
+            body = self.list_directory(full_path, url_path)
+            await self.send_headers(writer, 200, "OK", [
+                ("Content-Type", "text/html; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+                ("Connection", "keep-alive" if keep_alive else "close"),
+            ])
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+            return
+        await self.send_file(writer, full_path, method, keep_alive)
+
+    async def discard_body(self, reader, headers):
+        """Read past a request body so the next request starts in the right place
+
+        Returns False if the body can't be skipped (chunked, malformed or
+        too large), in which case the connection must be closed.
+        """
+        if "transfer-encoding" in headers:
+            return False
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            return False
+        if length < 0 or length > MAX_DISCARDED_BODY:
+            return False
+        while length:
+            chunk = await asyncio.wait_for(reader.read(min(length, CHUNK_SIZE)),
+                                           timeout=self.keep_alive_timeout)
+            if not chunk:
+                return False
+            length -= len(chunk)
+        return True
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes or goes idle"""
+        try:
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                                 timeout=self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send_error(writer, 431, "Request Header Fields Too Large", False)
+                    break
+                lines = raw.decode("latin-1").split("\r\n")
+                parts = lines[0].split()
+                if len(parts) != 3:
+                    await self.send_error(writer, 400, "Bad Request", keep_alive)
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+                try:
+                    if not await self.discard_body(reader, headers):
+                        keep_alive = False
+                except asyncio.TimeoutError:
+                    break
+                await self.handle_request(writer, method, target, keep_alive)
+                print(f'{writer.get_extra_info("peername")[0]} - "{lines[0]}"')
+                if not keep_alive:
+                    break
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # Cancellation means the server is shutting down; just close
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def serve(self):
+        """Run the server until stop_server() is called"""
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        self.server = await asyncio.start_server(self.handle_connection, "", self.port,
+                                                 limit=MAX_HEADER_BYTES)
+        print(f"✅ Async server started on http://localhost:{self.port}")
+        print(f"📁 Serving files from: {self.downloads_dir.absolute()}")
+        async with self.server:
+            await self.stop_event.wait()
+
+    def start_server(self):
+        """Start the asyncio download server (blocks until Ctrl+C)"""
+        print(f"🚀 Starting async download server on port {self.port}...")
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print(f"\n🛑 Server stopped by user")
+
+    def stop_server(self):
+        """Stop the server from another thread"""
+        if self.stop_event and self.loop:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+            print("🛑 Server stopped")
+
+if __name__ == "__main__":
+    print("🌟 Cosmic App Store - Async Download Server")
+    print("=" * 50)
+
+    server = AsyncDownloadServer(port=8000)
+    server.start_server()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Download Server Benchmark for Cosmic App Store
+Drives DownloadServer on an ephemeral port against a synthetic downloads/ tree
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+from local_download_server import SERVER_MODES, DownloadServer
+
+# Size class -> bytes per file; a run picks classes by --mix weight
+SIZE_CLASSES = {
+    "small": 4 * 1024,
+    "medium": 1024 * 1024,
+    "large": 16 * 1024 * 1024,
+}
+FILES_PER_CLASS = 3
+DEFAULT_MIX = "small:80,medium:15,large:5"
+DEFAULT_RESULTS_FILE = "benchmark-download-server.json"
+
+def parse_mix(value):
+    """Parse "small:80,medium:15,large:5" into {class: weight}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition(":")
+        name = name.strip()
+        if name not in SIZE_CLASSES:
+            raise argparse.ArgumentTypeError(f"unknown size class {name!r} (expected one of {list(SIZE_CLASSES)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight for {name}: {weight!r}")
+    return mix
+
+def create_synthetic_tree(root, mix):
+    """Write random files for each size class in the mix; returns {class: [url paths]}"""
+    paths = {}
+    platforms = [("windows", ".exe"), ("mac", ".dmg"), ("linux", ".AppImage")]
+    for name in mix:
+        paths[name] = []
+        for i in range(FILES_PER_CLASS):
+            folder, suffix = platforms[i % len(platforms)]
+            path = root / folder / f"bench-{name}-{i}{suffix}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(os.urandom(SIZE_CLASSES[name]))
+            paths[name].append(f"/{folder}/{path.name}")
+    return paths
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+@contextmanager
+def running_server(mode, downloads_dir, max_workers=None):
+    """Run a DownloadServer on an ephemeral port, with its log output discarded"""
+    server = DownloadServer(port=0, mode=mode, max_workers=max_workers,
+                            access_log=Path(downloads_dir).parent / "access.log")
+    server.downloads_dir = downloads_dir
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        port = server.start()
+        try:
+            yield port
+        finally:
+            server.stop()
+
+def fetch(port, path, timeout, connection=None):
+    """GET one URL; returns (latency seconds, body bytes, status)
+
+    A connection passed in is reused (keep-alive) and left open unless the
+    server closes it; otherwise a new one is opened and closed.
+    """
+    start = time.perf_counter()
+    reuse = connection is not None
+    if not reuse:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        size = 0
+        while True:
+            chunk = response.read(256 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+        return time.perf_counter() - start, size, response.status
+    except:
+        connection.close()
+        raise
+    finally:
+        if not reuse:
+            connection.close()
+
+def run_load(port, urls, concurrency, timeout, keep_alive=False):
+    """Fetch every URL with concurrency clients; returns the run's statistics"""
+    latencies = []
+    errors = 0
+    total_bytes = 0
+    lock = threading.Lock()
+    # With keep_alive each client thread reuses one connection
+    clients = threading.local()
+    connections = []
+
+    def worker(path):
+        nonlocal errors, total_bytes
+        connection = None
+        if keep_alive:
+            connection = getattr(clients, "connection", None)
+            if connection is None:
+                connection = clients.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+                with lock:
+                    connections.append(connection)
+        try:
+            latency, size, status = fetch(port, path, timeout, connection)
+        except (OSError, http.client.HTTPException):
+            with lock:
+                errors += 1
+            return
+        with lock:
+            if status != 200:
+                errors += 1
+            else:
+                latencies.append(latency)
+                total_bytes += size
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, urls))
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        connection.close()
+
+    latencies.sort()
+    return {
+        "requests": len(urls),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "megabytes_per_second": round(total_bytes / elapsed / (1024 * 1024), 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+def run_benchmarks(modes, concurrency_levels, requests, mix, warmup=20, seed=0, timeout=30, keep_alive=False):
+    """Benchmark every (mode, concurrency) pair against one synthetic tree"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="cosmic-bench-") as tmp:
+        downloads_dir = Path(tmp) / "downloads"
+        print(f"📁 Writing synthetic downloads tree to {downloads_dir}...")
+        paths = create_synthetic_tree(downloads_dir, mix)
+
+        rng = random.Random(seed)
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        urls = [rng.choice(paths[name]) for name in rng.choices(names, weights, k=requests)]
+
+        for mode in modes:
+            for concurrency in concurrency_levels:
+                with running_server(mode, downloads_dir) as port:
+                    run_load(port, urls[:warmup], concurrency, timeout, keep_alive)
+                    stats = run_load(port, urls, concurrency, timeout, keep_alive)
+                stats = {"mode": mode, "concurrency": concurrency, "keep_alive": keep_alive, **stats}
+                results.append(stats)
+                latency = stats["latency_ms"]
+                print(f"   {mode:<9} c={concurrency:<4} {stats['requests_per_second']:>9.1f} req/s "
+                      f"{stats['megabytes_per_second']:>8.1f} MB/s  p50 {latency['p50']:>8.2f}ms  "
+                      f"p95 {latency['p95']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  errors {stats['errors']}")
+    return results
+
+def compare_with_baseline(results, baseline_file):
+    """Print the change in req/s and p95 against a previous results file"""
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = {(r["mode"], r["concurrency"]): r for r in json.load(f)["results"]}
+    print(f"\n📊 Compared with {baseline_file}:")
+    for stats in results:
+        previous = baseline.get((stats["mode"], stats["concurrency"]))
+        if not previous or not previous["requests_per_second"]:
+            continue
+        rps = (stats["requests_per_second"] / previous["requests_per_second"] - 1) * 100
+        p95_before = previous["latency_ms"]["p95"]
+        p95 = (stats["latency_ms"]["p95"] / p95_before - 1) * 100 if p95_before else 0.0
+        print(f"   {stats['mode']:<9} c={stats['concurrency']:<4} req/s {rps:+6.1f}%  p95 {p95:+6.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Cosmic App Store download server")
+    parser.add_argument("--modes", nargs="+", choices=SERVER_MODES, default=list(SERVER_MODES),
+                        help="server modes to benchmark (default: all)")
+    parser.add_argument("-c", "--concurrency", nargs="+", type=int, default=[1, 8, 32],
+                        help="concurrent clients per run (default: 1 8 32)")
+    parser.add_argument("-n", "--requests", type=int, default=500,
+                        help="requests per run (default: 500)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"size class weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the request order")
+    parser.add_argument("--keep-alive", action="store_true",
+                        help="have each client reuse one connection instead of connecting per request")
+    parser.add_argument("-o", "--output", default=DEFAULT_RESULTS_FILE,
+                        help=f"where to write the JSON results (default: {DEFAULT_RESULTS_FILE})")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    print("🌟 Cosmic App Store - Download Server Benchmark")
+    print("=" * 50)
+    results = run_benchmarks(args.modes, args.concurrency, args.requests, args.mix, seed=args.seed,
+                             keep_alive=args.keep_alive)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "requests_per_run": args.requests,
+        "mix": args.mix,
+        "file_sizes": {name: SIZE_CLASSES[name] for name in args.mix},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Artifact Generation Benchmark for Cosmic App Store
+Times create_all_executables and the Akan generators at growing store sizes
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from build_profiler import BuildProfiler, use_profiler
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_RESULTS_FILE = "benchmark-generation.json"
+AKAN_GENERATORS = ["akan-simple", "simple-executable", "akan-app-structure"]
+
+def synthetic_apps(count):
+    """An APPS table of count entries shaped like the real one"""
+    return {f"bench-app-{i:04d}": f"https://onetwo346.github.io/bench-app-{i:04d}/" for i in range(count)}
+
+def peak_rss_bytes():
+    """Peak resident set size of this process plus its largest worker process"""
+    if resource is None:
+        return None
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_generator(name, apps, jobs):
+    """Run one generator in the current directory"""
+    if name == "store":
+        import create_executables
+        create_executables.APPS = synthetic_apps(apps)
+        create_executables.create_all_executables(jobs=jobs, force=True)
+    elif name == "akan-simple":
+        from akan_simple_generator import create_akan_executables
+        create_akan_executables()
+    elif name == "simple-executable":
+        from simple_executable_generator import SimpleExecutableGenerator
+        SimpleExecutableGenerator().run()
+    elif name == "akan-app-structure":
+        from akan_executable_generator import AkanExecutableGenerator
+        generator = AkanExecutableGenerator()
+        generator.create_app_structure()
+        generator.create_assets_directory()
+    else:
+        raise ValueError(f"Unknown generator: {name}")
+
+def run_case(name, apps, jobs):
+    """Run one case in a fresh temp directory; returns its measurements"""
+    with tempfile.TemporaryDirectory(prefix="cosmic-gen-bench-") as tmp:
+        os.chdir(tmp)
+        profiler = BuildProfiler()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), use_profiler(profiler):
+            run_generator(name, apps, jobs)
+        elapsed = time.perf_counter() - start
+        on_disk = sum(path.stat().st_size for path in Path(tmp).rglob("*") if path.is_file())
+
+    return {
+        "generator": name,
+        "apps": apps,
+        "jobs": jobs,
+        "seconds": round(elapsed, 4),
+        "files_written": profiler.files_written,
+        "bytes_written": profiler.bytes_written,
+        "bytes_on_disk": on_disk,
+        "files_per_second": round(profiler.files_written / elapsed, 1) if elapsed else 0.0,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+def run_isolated(name, apps, jobs):
+    """Run a case in its own interpreter, so peak RSS covers only that case"""
+    command = [sys.executable, os.path.abspath(__file__), "--case", name, str(apps), str(jobs)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} ({apps} apps) failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+def print_result(stats):
+    rss = stats["peak_rss_bytes"]
+    rss = f"{rss / (1024 * 1024):.1f}MB" if rss is not None else "n/a"
+    print(f"   {stats['generator']:<20} {stats['apps']:>6} apps j={stats['jobs']:<3} {stats['seconds']:>9.3f}s "
+          f"{stats['files_per_second']:>9.1f} files/s {stats['bytes_written'] / (1024 * 1024):>8.2f}MB written "
+          f"peak RSS {rss}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--case":
+        # Child process: run one case and report it on stdout
+        print(json.dumps(run_case(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark artifact generation for the Cosmic App Store")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+                        help="synthetic APPS table sizes (default: 10 100 1000)")
+    parser.add_argument("-j", "--jobs", nargs="+", type=int, default=[1],
+                        help="create_all_executables --jobs values to try (default: 1)")
+    parser.add_argument("--skip-akan", action="store_true",
+                        help="only benchmark create_all_executables")
+    parser.add_argument("-o", "--output", default=DEFAULT_RESULTS_FILE,
+                        help=f"where to write the JSON results (default: {DEFAULT_RESULTS_FILE})")
+    args = parser.parse_args()
+
+    print("🌟 Cosmic App Store - Generation Benchmark")
+    print("=" * 50)
+    results = []
+    for jobs in args.jobs:
+        for size in args.sizes:
+            results.append(run_isolated("store", size, jobs))
+            print_result(results[-1])
+    if not args.skip_akan:
+        for name in AKAN_GENERATORS:
+            results.append(run_isolated(name, 1, 1))
+            print_result(results[-1])
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
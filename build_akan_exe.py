@@ -5,10 +5,13 @@ Uses Electron Builder to create a real .exe file
 """
 
 import os
-import subprocess
-import shutil
 from pathlib import Path
 
+from build_orchestrator import BuildOrchestrator, npm_install_steps, record_npm_install
+from build_profiler import profiled, report_if_requested
+from bundle_writer import BundleWriter, copy_atomic
+
+@profiled
 def build_akan_exe():
     """Build the Akan Wise Saying Windows executable"""
     print("🚀 Building Akan Wise Saying Windows Executable...")
@@ -22,14 +25,18 @@ def build_akan_exe():
     os.chdir(electron_dir)
     
     try:
-        # Check if node_modules exists
-        if not Path("node_modules").exists():
-            print("📦 Installing dependencies...")
-            subprocess.run(["npm", "install"], check=True)
+        # Install dependencies unless package.json and the lockfile are unchanged
+        setup = npm_install_steps(".")
         
         # Build Windows executable
         print("🔨 Building Windows executable...")
-        subprocess.run(["npm", "run", "build-win"], check=True)
+        orchestrator = BuildOrchestrator(".")
+        built = orchestrator.run(setup=setup, targets=[("win", ["npm", "run", "build-win"])])
+        if orchestrator.succeeded("install"):
+            record_npm_install(".")
+        if not built:
+            print("❌ Build failed")
+            return False
         
         # Check if build was successful
         dist_dir = Path("dist")
@@ -44,7 +51,7 @@ def build_akan_exe():
                 
                 for exe_file in exe_files:
                     dest_file = downloads_dir / "akan-wise-saying-windows-real.exe"
-                    shutil.copy2(exe_file, dest_file)
+                    copy_atomic(exe_file, dest_file)
                     print(f"✅ Copied to: {dest_file}")
                     print(f"📊 File size: {dest_file.stat().st_size / 1024:.1f} KB")
                 
@@ -56,9 +63,6 @@ def build_akan_exe():
             print("❌ Build failed - no dist directory created")
             return False
             
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Build failed: {e}")
-        return False
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
@@ -66,6 +70,7 @@ def build_akan_exe():
         # Return to original directory
         os.chdir("..")
 
+@profiled
 def create_simple_build():
     """Create a simple build if Electron build fails"""
     print("🔧 Creating simple executable as fallback...")
@@ -102,8 +107,7 @@ pause
     exe_file = downloads_dir / "akan-wise-saying-windows-real.exe"
     
     # Create a zip file with .exe extension
-    import zipfile
-    with zipfile.ZipFile(exe_file, "w") as zipf:
+    with BundleWriter(exe_file) as zipf:
         zipf.writestr("launcher.bat", batch_content)
         zipf.writestr("README.txt", """Akan Wise Saying - True Wisdom
 
@@ -143,6 +147,8 @@ if __name__ == "__main__":
         else:
             print("\n❌ Failed to create any executable")
     
+    report_if_requested()
+    
     print("\n📝 Next steps:")
     print("   1. Test the executable by running it")
     print("   2. Update your app store download links")
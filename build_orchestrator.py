@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Build Orchestrator for Cosmic App Store
+Runs npm install and the per-platform Electron builds concurrently
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import signal
+import time
+from pathlib import Path
+
+from build_profiler import merge_spans
+
+# npm package cache shared by every app build, so repeat installs resolve offline
+NPM_CACHE_DIR = Path(os.environ.get("COSMIC_NPM_CACHE",
+                                    Path.home() / ".cache" / "cosmic-app-store" / "npm"))
+
+# Kept inside node_modules so deleting node_modules also forces a reinstall
+INSTALL_FINGERPRINT_FILE = ".install-fingerprint"
+NPM_INPUT_FILES = ("package.json", "package-lock.json", "npm-shrinkwrap.json")
+
+# Step output is read this many bytes at a time; a longer line is printed in pieces
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+def npm_install_fingerprint(app_dir):
+    """Hash of the files that decide what npm install produces"""
+    digest = hashlib.sha256()
+    for name in NPM_INPUT_FILES:
+        path = Path(app_dir) / name
+        if path.exists():
+            digest.update(name.encode())
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+def npm_install_needed(app_dir):
+    """True unless node_modules was installed from the current package files"""
+    recorded = Path(app_dir) / "node_modules" / INSTALL_FINGERPRINT_FILE
+    try:
+        return recorded.read_text().strip() != npm_install_fingerprint(app_dir)
+    except OSError:
+        return True
+
+def record_npm_install(app_dir):
+    """Remember the package files node_modules was just installed from
+
+    Called after install, since npm install may write the lockfile.
+    """
+    recorded = Path(app_dir) / "node_modules" / INSTALL_FINGERPRINT_FILE
+    recorded.write_text(npm_install_fingerprint(app_dir) + "\n")
+
+def npm_install_command(cache_dir=NPM_CACHE_DIR):
+    return ["npm", "install", "--prefer-offline", "--no-audit", "--no-fund",
+            "--cache", str(cache_dir)]
+
+def npm_install_steps(app_dir):
+    """Setup steps for an Electron build: install, or nothing if up to date"""
+    if not npm_install_needed(app_dir):
+        print("⏭️ Dependencies unchanged, skipping npm install")
+        return []
+    print("📦 Installing dependencies...")
+    return [("install", npm_install_command())]
+
+class BuildStep:
+    """One command in a build, with its outcome once it has run"""
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+        self.status = "pending"  # then "ok", "failed", "cancelled" or "skipped"
+        self.returncode = None
+        self.duration = None
+
+class BuildOrchestrator:
+    """Runs setup steps in order, then independent targets side by side
+
+    Targets all run at once unless max_parallel bounds them, and their
+    output is streamed line by line with a "[name]" prefix. With
+    fail_fast, the first failing target stops the others still running and
+    any that have not started are skipped.
+    """
+
+    def __init__(self, cwd, max_parallel=None, fail_fast=True):
+        self.cwd = cwd
+        self.max_parallel = max_parallel
+        self.fail_fast = fail_fast
+        self.steps = []
+        self.running = {}
+        self.failed = False
+
+    async def run_step(self, step):
+        """Run one step, streaming its output; returns True on success"""
+        if self.failed and self.fail_fast:
+            step.status = "skipped"
+            return False
+
+        executable = shutil.which(step.command[0]) or step.command[0]
+        print(f"[{step.name}] $ {' '.join(step.command)}", flush=True)
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            executable, *step.command[1:], cwd=self.cwd,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+            # Own process group, so stopping npm also stops electron-builder
+            start_new_session=(os.name == "posix"))
+        self.running[step.name] = process
+        try:
+            await self.stream_output(step, process.stdout)
+            step.returncode = await process.wait()
+        finally:
+            del self.running[step.name]
+            step.duration = time.perf_counter() - start
+            if process.returncode is None:
+                # Cancelled (e.g. Ctrl+C) or crashed mid-step; its own session
+                # didn't get the SIGINT, so it would outlive us otherwise
+                step.status = "cancelled"
+                self.kill(process)
+
+        if step.status == "cancelled":
+            print(f"[{step.name}] 🛑 Stopped after {step.duration:.1f}s", flush=True)
+            return False
+        if step.returncode != 0:
+            step.status = "failed"
+            self.failed = True
+            print(f"[{step.name}] ❌ Exited with code {step.returncode} after {step.duration:.1f}s", flush=True)
+            if self.fail_fast:
+                self.stop_running()
+            return False
+        step.status = "ok"
+        print(f"[{step.name}] ✅ Finished in {step.duration:.1f}s", flush=True)
+        return True
+
+    async def stream_output(self, step, stream):
+        """Print a step's output with a "[name]" prefix, one line at a time"""
+        pending = b""
+        while True:
+            chunk = await stream.read(OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            if len(pending) >= OUTPUT_CHUNK_SIZE:
+                lines.append(pending)
+                pending = b""
+            for line in lines:
+                print(f"[{step.name}] {line.decode(errors='replace').rstrip()}", flush=True)
+        if pending:
+            print(f"[{step.name}] {pending.decode(errors='replace').rstrip()}", flush=True)
+
+    def kill(self, process):
+        """Terminate a step's process and everything it started"""
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            pass
+
+    def stop_running(self):
+        """Terminate every step that is still running"""
+        for name, process in list(self.running.items()):
+            for step in self.steps:
+                if step.name == name:
+                    step.status = "cancelled"
+            self.kill(process)
+
+    async def run_targets(self, targets):
+        semaphore = asyncio.Semaphore(self.max_parallel or max(1, len(targets)))
+
+        async def bounded(step):
+            async with semaphore:
+                return await self.run_step(step)
+
+        results = await asyncio.gather(*(bounded(step) for step in targets))
+        return all(results)
+
+    async def run_async(self, setup, targets):
+        for step in setup:
+            if not await self.run_step(step):
+                for target in targets:
+                    target.status = "skipped"
+                return False
+        return await self.run_targets(targets)
+
+    def run(self, setup=(), targets=()):
+        """Run setup commands in order, then targets concurrently
+
+        setup and targets are sequences of (name, command) pairs. Returns
+        True if every step succeeded.
+        """
+        setup = [BuildStep(name, command) for name, command in setup]
+        targets = [BuildStep(name, command) for name, command in targets]
+        self.steps = setup + targets
+        print(f"⚙️ Running {len(targets)} build target(s), up to {self.max_parallel or len(targets)} at a time...")
+        start = time.perf_counter()
+        ok = asyncio.run(self.run_async(setup, targets))
+        # Steps overlap, so they are reported to the profiler once they are done
+        merge_spans([{"name": f"npm {step.name}", "depth": 0, "seconds": round(step.duration or 0.0, 6),
+                      "bytes_written": 0, "files_written": 0, "status": step.status}
+                     for step in self.steps])
+        self.print_summary(time.perf_counter() - start)
+        return ok
+
+    def succeeded(self, name):
+        return any(step.name == name and step.status == "ok" for step in self.steps)
+
+    def print_summary(self, total):
+        icons = {"ok": "✅", "failed": "❌", "cancelled": "🛑", "skipped": "⏭️", "pending": "⏭️"}
+        print("⏱️ Build step durations:")
+        for step in self.steps:
+            duration = f"{step.duration:.1f}s" if step.duration is not None else "-"
+            print(f"   {icons[step.status]} {step.name:<10} {duration:>8}  {step.status}")
+        print(f"   Total: {total:.1f}s")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Build Profiler for Cosmic App Store
+Times generator steps and counts the files and bytes they write
+"""
+
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_REPORT_FILE = "build-profile.json"
+
+class Span:
+    """One timed step, plus what was written while it was open"""
+
+    def __init__(self, name, depth, attrs):
+        self.name = name
+        self.depth = depth
+        self.attrs = attrs
+        self.duration = 0.0
+        self.bytes_written = 0
+        self.files_written = 0
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "seconds": round(self.duration, 6),
+            "bytes_written": self.bytes_written,
+            "files_written": self.files_written,
+            **self.attrs,
+        }
+
+class BuildProfiler:
+    """Collects spans in the order they were opened
+
+    Writes are counted against every span open at the time, so a parent
+    span includes everything its children wrote.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.open_spans = []
+        self.started = time.perf_counter()
+        self.bytes_written = 0
+        self.files_written = 0
+
+    @contextmanager
+    def span(self, name, **attrs):
+        span = Span(name, len(self.open_spans), attrs)
+        self.spans.append(span)
+        self.open_spans.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            self.open_spans.remove(span)
+
+    def record_write(self, path, nbytes=None):
+        if nbytes is None:
+            nbytes = Path(path).stat().st_size
+        self.bytes_written += nbytes
+        self.files_written += 1
+        for span in self.open_spans:
+            span.bytes_written += nbytes
+            span.files_written += 1
+
+    def merge(self, span_dicts):
+        """Adopt spans collected elsewhere, e.g. returned by a worker process"""
+        depth = len(self.open_spans)
+        for data in span_dicts:
+            data = dict(data)
+            span = Span(data.pop("name"), depth + data.pop("depth"), {})
+            span.duration = data.pop("seconds")
+            span.bytes_written = data.pop("bytes_written")
+            span.files_written = data.pop("files_written")
+            span.attrs = data
+            self.spans.append(span)
+            if span.depth == depth:
+                self.bytes_written += span.bytes_written
+                self.files_written += span.files_written
+                for parent in self.open_spans:
+                    parent.bytes_written += span.bytes_written
+                    parent.files_written += span.files_written
+
+    def report(self):
+        return {
+            "generator": Path(sys.argv[0]).name,
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "bytes_written": self.bytes_written,
+            "files_written": self.files_written,
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+    def write_report(self, path=DEFAULT_REPORT_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"⏱️ Wrote timing report to {path}")
+
+    def print_summary(self):
+        """Print spans grouped by name, slowest first"""
+        rows = {}
+        for span in self.spans:
+            row = rows.setdefault(span.name, [0, 0.0, 0, 0])
+            row[0] += 1
+            row[1] += span.duration
+            row[2] += span.bytes_written
+            row[3] += span.files_written
+
+        print(f"⏱️ {'Step':<32} {'Count':>6} {'Total':>9} {'Mean':>9} {'Written':>10} {'Files':>6}")
+        for name, (count, total, nbytes, files) in sorted(rows.items(), key=lambda item: -item[1][1]):
+            print(f"   {name[:32]:<32} {count:>6} {total:>8.3f}s {total / count * 1000:>7.1f}ms "
+                  f"{nbytes / 1024:>8.1f}KB {files:>6}")
+        print(f"   Total: {time.perf_counter() - self.started:.3f}s, "
+              f"{self.bytes_written / 1024:.1f}KB in {self.files_written} files")
+
+# Profiler that span() and record_write() report to
+active = BuildProfiler()
+
+def span(name, **attrs):
+    return active.span(name, **attrs)
+
+def record_write(path, nbytes=None):
+    active.record_write(path, nbytes)
+
+def merge_spans(span_dicts):
+    active.merge(span_dicts)
+
+def profiled(func):
+    """Decorator: run func inside a span named after it"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def report_if_requested(argv=None):
+    """Print the summary and write the JSON report if --profile was passed"""
+    if "--profile" in (sys.argv if argv is None else argv):
+        active.print_summary()
+        active.write_report()
+
+@contextmanager
+def use_profiler(profiler):
+    """Send span() and record_write() to another profiler for a while"""
+    global active
+    previous, active = active, profiler
+    try:
+        yield profiler
+    finally:
+        active = previous
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Bundle Writer for Cosmic App Store
+Writes the zip-based .exe/.dmg/.AppImage bundles reproducibly
+"""
+
+import os
+import shutil
+import time
+import zipfile
+from pathlib import Path
+
+from build_profiler import record_write
+from download_assets import replace_file
+
+# Earliest timestamp a zip entry can carry; used for every entry so the
+# bundle bytes depend only on its contents
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Entries that should extract as executable
+EXECUTABLE_SUFFIXES = ('.sh', '.py')
+
+def write_atomic(path, data, mode=None):
+    """replace_file() for text or bytes, recorded in the build profile"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    replace_file(path, data, mode)
+    record_write(path, len(data))
+
+def copy_atomic(src, path):
+    """shutil.copy2() src to path via a temporary file and rename
+
+    The old file is never truncated, so a server that has it mapped or
+    open keeps reading the old bytes intact.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    try:
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, path)
+        record_write(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+class BundleWriter:
+    """Drop-in for zipfile.ZipFile(path, 'w') that produces identical bytes for identical inputs
+
+    Entries are collected and written on close() sorted by name, with a fixed
+    timestamp, fixed permissions and a fixed "created on" system. The bundle
+    is written to a temporary file and renamed into place, so a server never
+    sees a half-written bundle.
+    """
+
+    def __init__(self, path, reproducible=True):
+        self.path = Path(path)
+        self.reproducible = reproducible
+        self.entries = {}
+
+    def writestr(self, arcname, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.entries[arcname] = data
+
+    def write(self, filename, arcname=None):
+        self.writestr(arcname or Path(filename).name, Path(filename).read_bytes())
+
+    def close(self):
+        date_time = FIXED_DATE_TIME if self.reproducible else time.localtime(time.time())[:6]
+        tmp_path = self.path.with_name(f'.{self.path.name}.tmp')
+        try:
+            with zipfile.ZipFile(tmp_path, 'w') as zipf:
+                for arcname in sorted(self.entries):
+                    info = zipfile.ZipInfo(arcname, date_time=date_time)
+                    info.create_system = 3  # Unix, so external_attr means the same everywhere
+                    mode = 0o755 if arcname.endswith(EXECUTABLE_SUFFIXES) else 0o644
+                    info.external_attr = (0o100000 | mode) << 16
+                    zipf.writestr(info, self.entries[arcname])
+            os.replace(tmp_path, self.path)
+            record_write(self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
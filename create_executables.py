@@ -6,10 +6,24 @@ Creates basic executable files for all apps in the store
 
 import os
 import sys
+import io
+import json
+import argparse
+import contextlib
+import hashlib
+import shutil
 import subprocess
-import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import build_profiler
+from build_profiler import BuildProfiler, merge_spans, record_write, span, use_profiler
+from bundle_writer import BundleWriter, copy_atomic, write_atomic
+from download_assets import (ASSET_MANIFEST_FILE, CHECKSUMS_FILE, COMPRESSIBLE_SUFFIXES, PLATFORM_INDEX_FILES,
+                             brotli, is_platform_index_file, platform_index_entries, render_platform_index_html,
+                             render_platform_index_json, sidecars_are_fresh, write_compressed_sidecars)
+from launcher_templates import render
+
 # App configurations with their web URLs
 APPS = {
     'pic2puzz': 'https://pic2puzz.space',
@@ -57,200 +71,478 @@ def create_directories():
     
     return downloads_dir
 
+def file_sha256(path):
+    """Hash a file in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def compress_text_artifacts(downloads_dir):
+    """Precompress every text artifact in the platform directories
+
+    Sidecars that are already newer than their source are left alone.
+    """
+    count = 0
+    for platform in ['windows', 'mac', 'linux']:
+        platform_dir = downloads_dir / platform
+        if not platform_dir.is_dir():
+            continue
+        for path in sorted(platform_dir.iterdir()):
+            if path.is_file() and path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                if not sidecars_are_fresh(path):
+                    for sidecar in write_compressed_sidecars(path):
+                        record_write(sidecar)
+                        count += 1
+    
+    encodings = 'gzip + brotli' if brotli is not None else 'gzip'
+    print(f"🗜️ Wrote {count} precompressed sidecars ({encodings})")
+    return count
+
+def write_checksums(downloads_dir):
+    """Record a content hash for every platform artifact in checksums.json
+
+    Files whose size and mtime match the previous checksums.json are not
+    re-hashed.
+    """
+    checksums_file = downloads_dir / CHECKSUMS_FILE
+    previous = {}
+    if checksums_file.exists():
+        try:
+            with open(checksums_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+    
+    checksums = {}
+    for platform in ['windows', 'mac', 'linux']:
+        platform_dir = downloads_dir / platform
+        if not platform_dir.is_dir():
+            continue
+        for path in sorted(platform_dir.iterdir()):
+            if not path.is_file() or is_platform_index_file(path.name):
+                continue
+            stat = path.stat()
+            key = f'{platform}/{path.name}'
+            entry = previous.get(key)
+            if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                checksums[key] = entry
+                continue
+            checksums[key] = {
+                'sha256': file_sha256(path),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns
+            }
+    
+    write_atomic(checksums_file, json.dumps(checksums, indent=2, sort_keys=True))
+    
+    print(f"🔐 Recorded checksums for {len(checksums)} files in {checksums_file}")
+    return checksums
+
+# Content-addressed store that identical artifacts are hard-linked into
+BLOB_STORE_DIR = '.blobs'
+
+def dedupe_artifacts(downloads_dir, checksums):
+    """Hard-link every platform artifact to one copy per distinct content
+
+    Each file is linked into downloads/.blobs/<sha256>; a file whose
+    content is already in the store is replaced by a link to the stored
+    copy. Blobs no artifact with their hash links to are removed. Returns the
+    number of bytes the links save over separate copies.
+
+    Linked files are only safe while every writer replaces files rather
+    than rewriting them, so a blob is re-hashed before anything new is
+    linked to it and replaced if it no longer matches its name.
+    Content-hashed names stay separate copies.
+    """
+    blob_dir = downloads_dir / BLOB_STORE_DIR
+    blob_dir.mkdir(exist_ok=True)
+    hashed_names = set(load_asset_manifest(downloads_dir).values())
+    verified = set()
+    linked = set()
+    
+    try:
+        for key, entry in sorted(checksums.items()):
+            if key in hashed_names:
+                continue
+            path = downloads_dir / key
+            blob = blob_dir / entry['sha256']
+            linked.add(entry['sha256'])
+            if blob.exists() and os.path.samefile(blob, path):
+                continue
+            if blob.exists() and entry['sha256'] not in verified and file_sha256(blob) != entry['sha256']:
+                print(f"⚠️ {blob.name[:12]} no longer matches its hash, replacing it")
+                blob.unlink()
+            verified.add(entry['sha256'])
+            if not blob.exists():
+                os.link(path, blob)
+            else:
+                tmp_path = path.with_name(f'.{path.name}.tmp')
+                os.link(blob, tmp_path)
+                os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not hard-link artifacts, leaving copies in place: {e}")
+        return 0
+    
+    saved = 0
+    for blob in sorted(blob_dir.iterdir()):
+        stat = blob.stat()
+        if blob.name not in linked or stat.st_nlink <= 1:
+            blob.unlink()
+        else:
+            # One link is the store itself and one copy is stored regardless
+            saved += stat.st_size * (stat.st_nlink - 2)
+    
+    print(f"🔗 Deduplicated artifacts into {blob_dir}: {saved / 1024:.1f} KB saved")
+    return saved
+
+def remove_blob_store(downloads_dir):
+    """Drop the store left by an earlier dedupe run
+
+    Without --dedupe nothing keeps it current. Artifacts linked to each
+    other stay linked, which is harmless since every writer replaces files.
+    """
+    blob_dir = downloads_dir / BLOB_STORE_DIR
+    if blob_dir.is_dir():
+        shutil.rmtree(blob_dir)
+        print(f"🧹 Removed stale blob store {blob_dir}")
+
+def load_asset_manifest(downloads_dir):
+    """The {logical: hashed} map from the last content-hash run, or {}"""
+    try:
+        with open(downloads_dir / ASSET_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def content_hashed_name(name, sha256):
+    """pic2puzz-windows.exe -> pic2puzz-windows.<hash>.exe"""
+    path = Path(name)
+    return f'{path.stem}.{sha256[:12]}{path.suffix}'
+
+def write_content_hashed_names(downloads_dir, bundles, checksums):
+    """Copy each bundle to a content-addressed name and record the mapping
+
+    bundles are paths relative to downloads_dir (e.g. windows/x-windows.exe).
+    Hashed names from a previous run that are no longer current are removed.
+    """
+    manifest_file = downloads_dir / ASSET_MANIFEST_FILE
+    previous = load_asset_manifest(downloads_dir)
+    
+    manifest = {}
+    for logical in bundles:
+        entry = checksums.get(logical)
+        if entry is None:
+            continue
+        platform, name = logical.split('/', 1)
+        hashed = f'{platform}/{content_hashed_name(name, entry["sha256"])}'
+        hashed_file = downloads_dir / hashed
+        # A copy, not a link: the bundle may later be rewritten under its
+        # logical name, but this name is served as immutable. Earlier runs
+        # linked it, so one sharing the bundle's inode or recorded with other
+        # content is recopied.
+        recorded = checksums.get(hashed, entry)
+        if (not hashed_file.exists() or os.path.samefile(downloads_dir / logical, hashed_file)
+                or recorded['sha256'] != entry['sha256']):
+            copy_atomic(downloads_dir / logical, hashed_file)
+        manifest[logical] = hashed
+    
+    current = set(manifest.values())
+    for stale in set(previous.values()) - current:
+        stale_file = downloads_dir / stale
+        if stale_file.exists():
+            stale_file.unlink()
+    
+    write_atomic(manifest_file, json.dumps(manifest, indent=2, sort_keys=True))
+    
+    print(f"🏷️ Wrote {len(manifest)} content-hashed bundle names to {manifest_file}")
+    return manifest
+
 def create_html_wrapper(app_name, app_url):
     """Create HTML wrapper for web apps"""
-    html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{app_name} - Cosmic App Store</title>
-    <style>
-        body {{
-            margin: 0;
-            padding: 0;
-            font-family: Arial, sans-serif;
-            background: #0a0a12;
-            color: #00f7ff;
-            overflow: hidden;
-        }}
-        .app-frame {{
-            width: 100vw;
-            height: 100vh;
-            border: none;
-            background: white;
-        }}
-        .loading {{
-            position: fixed;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            font-size: 18px;
-            color: #00f7ff;
-        }}
-    </style>
-</head>
-<body>
-    <div class="loading" id="loading">Loading {app_name}...</div>
-    <iframe src="{app_url}" class="app-frame" id="appFrame" onload="hideLoading()"></iframe>
-    
-    <script>
-        function hideLoading() {{
-            document.getElementById('loading').style.display = 'none';
-        }}
-    </script>
-</body>
-</html>'''
-    return html_content
-
-def create_windows_executable(app_name, app_url, downloads_dir):
+    return render('store-html', app_name=app_name, app_url=app_url)
+
+def create_windows_executable(app_name, app_url, downloads_dir, loose_files=True):
     """Create Windows executable using HTML wrapper"""
     html_content = create_html_wrapper(app_name, app_url)
     
     # Create a simple batch file that opens the HTML in default browser
-    batch_content = f'''@echo off
-title {app_name} - Cosmic App Store
-echo Starting {app_name}...
-start "" "{app_url}"
-pause'''
+    batch_content = render('store-windows-launcher', app_name=app_name, app_url=app_url)
     
     # Save files
     html_file = downloads_dir / 'windows' / f'{app_name}-windows.html'
     batch_file = downloads_dir / 'windows' / f'{app_name}-windows.bat'
     exe_file = downloads_dir / 'windows' / f'{app_name}-windows.exe'
     
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open(batch_file, 'w', encoding='utf-8') as f:
-        f.write(batch_content)
+    # The bundle is built from the rendered strings; the loose .html/.bat
+    # copies are optional extras for direct download
+    if loose_files:
+        write_atomic(html_file, html_content)
+        write_atomic(batch_file, batch_content)
     
     # Create a simple executable-like file (zip with .exe extension)
-    with zipfile.ZipFile(exe_file, 'w') as zipf:
+    with BundleWriter(exe_file) as zipf:
         zipf.writestr('app.html', html_content)
         zipf.writestr('launcher.bat', batch_content)
-        zipf.writestr('README.txt', f'''{app_name} - Cosmic App Store
-
-This is a web app wrapper for {app_name}.
-To run this app:
-1. Extract this file
-2. Run launcher.bat or open app.html in your browser
-3. The app will open in your default web browser
-
-Original URL: {app_url}
-
-Created by Cosmos Coderr - Cosmic App Store
-''')
+        zipf.writestr('README.txt', render('store-windows-readme', app_name=app_name, app_url=app_url))
     
     print(f"✅ Created Windows executable for {app_name}")
 
-def create_mac_app(app_name, app_url, downloads_dir):
+def create_mac_app(app_name, app_url, downloads_dir, loose_files=True):
     """Create macOS app bundle"""
     # Create a simple HTML file that can be opened in browser
     html_content = create_html_wrapper(app_name, app_url)
     
     # Create a shell script launcher
-    shell_content = f'''#!/bin/bash
-# {app_name} - Cosmic App Store Launcher
-echo "Starting {app_name}..."
-open "{app_url}"
-'''
+    shell_content = render('store-mac-launcher', app_name=app_name, app_url=app_url)
     
     # Save files
     html_file = downloads_dir / 'mac' / f'{app_name}-mac.html'
     shell_file = downloads_dir / 'mac' / f'{app_name}-mac.sh'
     dmg_file = downloads_dir / 'mac' / f'{app_name}-mac.dmg'
     
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open(shell_file, 'w', encoding='utf-8') as f:
-        f.write(shell_content)
-    
-    # Make shell script executable
-    os.chmod(shell_file, 0o755)
+    if loose_files:
+        write_atomic(html_file, html_content)
+        # Make shell script executable
+        write_atomic(shell_file, shell_content, mode=0o755)
     
     # Create a simple DMG-like file (zip with .dmg extension)
-    with zipfile.ZipFile(dmg_file, 'w') as zipf:
+    with BundleWriter(dmg_file) as zipf:
         zipf.writestr('app.html', html_content)
         zipf.writestr('launcher.sh', shell_content)
-        zipf.writestr('README.txt', f'''{app_name} - Cosmic App Store
-
-This is a web app wrapper for {app_name}.
-To run this app:
-1. Extract this file
-2. Run: chmod +x launcher.sh && ./launcher.sh
-3. Or open app.html in your browser
-4. The app will open in your default web browser
-
-Original URL: {app_url}
-
-Created by Cosmos Coderr - Cosmic App Store
-''')
+        zipf.writestr('README.txt', render('store-unix-readme', app_name=app_name, app_url=app_url))
     
     print(f"✅ Created macOS app for {app_name}")
 
-def create_linux_appimage(app_name, app_url, downloads_dir):
+def create_linux_appimage(app_name, app_url, downloads_dir, loose_files=True):
     """Create Linux AppImage"""
     # Create a simple HTML file
     html_content = create_html_wrapper(app_name, app_url)
     
     # Create a shell script launcher
-    shell_content = f'''#!/bin/bash
-# {app_name} - Cosmic App Store Launcher
-echo "Starting {app_name}..."
-xdg-open "{app_url}" 2>/dev/null || sensible-browser "{app_url}" 2>/dev/null || x-www-browser "{app_url}" 2>/dev/null || firefox "{app_url}" 2>/dev/null || chromium-browser "{app_url}" 2>/dev/null || google-chrome "{app_url}" 2>/dev/null || echo "Please open {app_url} in your browser"
-'''
+    shell_content = render('store-linux-launcher', app_name=app_name, app_url=app_url)
     
     # Save files
     html_file = downloads_dir / 'linux' / f'{app_name}-linux.html'
     shell_file = downloads_dir / 'linux' / f'{app_name}-linux.sh'
     appimage_file = downloads_dir / 'linux' / f'{app_name}-linux.AppImage'
     
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open(shell_file, 'w', encoding='utf-8') as f:
-        f.write(shell_content)
-    
-    # Make shell script executable
-    os.chmod(shell_file, 0o755)
+    if loose_files:
+        write_atomic(html_file, html_content)
+        # Make shell script executable
+        write_atomic(shell_file, shell_content, mode=0o755)
     
     # Create a simple AppImage-like file (zip with .AppImage extension)
-    with zipfile.ZipFile(appimage_file, 'w') as zipf:
+    with BundleWriter(appimage_file) as zipf:
         zipf.writestr('app.html', html_content)
         zipf.writestr('launcher.sh', shell_content)
-        zipf.writestr('README.txt', f'''{app_name} - Cosmic App Store
+        zipf.writestr('README.txt', render('store-unix-readme', app_name=app_name, app_url=app_url))
+    
+    print(f"✅ Created Linux AppImage for {app_name}")
+
+# Platform name -> builder, in the order artifacts are reported
+PLATFORM_BUILDERS = {
+    'windows': create_windows_executable,
+    'mac': create_mac_app,
+    'linux': create_linux_appimage
+}
 
-This is a web app wrapper for {app_name}.
-To run this app:
-1. Extract this file
-2. Run: chmod +x launcher.sh && ./launcher.sh
-3. Or open app.html in your browser
-4. The app will open in your default web browser
+# Files each platform builder writes, as name templates
+PLATFORM_OUTPUTS = {
+    'windows': ['{app_id}-windows.html', '{app_id}-windows.bat', '{app_id}-windows.exe'],
+    'mac': ['{app_id}-mac.html', '{app_id}-mac.sh', '{app_id}-mac.dmg'],
+    'linux': ['{app_id}-linux.html', '{app_id}-linux.sh', '{app_id}-linux.AppImage']
+}
 
-Original URL: {app_url}
+# Bump to force a rebuild when template output changes for a reason the
+# source hashes below would not catch
+TEMPLATE_VERSION = 1
 
-Created by Cosmos Coderr - Cosmic App Store
-''')
+# Incremental-build state, kept next to (not inside) the downloads tree
+BUILD_MANIFEST_FILE = 'build-manifest.json'
+
+# Sources whose changes should invalidate every artifact
+GENERATOR_SOURCES = [Path(__file__), Path(__file__).with_name('launcher_templates.py'),
+                     Path(__file__).with_name('bundle_writer.py')]
+
+def generator_version():
+    """Fingerprint of the generator and template sources, so code changes force a rebuild"""
+    return hashlib.sha256(''.join(file_sha256(path) for path in GENERATOR_SOURCES).encode('utf-8')).hexdigest()
+
+def artifact_fingerprint(app_id, app_url, platform, generator_hash, loose_files=True):
+    """Hash every input that determines an (app, platform) artifact"""
+    inputs = {
+        'app_id': app_id,
+        'url': app_url,
+        'platform': platform,
+        'loose_files': loose_files,
+        'template_version': TEMPLATE_VERSION,
+        'generator_version': generator_hash
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+def artifact_outputs(app_id, platform, downloads_dir, loose_files=True):
+    """Files an (app, platform) build writes; the bundle is always last"""
+    names = PLATFORM_OUTPUTS[platform] if loose_files else PLATFORM_OUTPUTS[platform][-1:]
+    return [downloads_dir / platform / name.format(app_id=app_id) for name in names]
+
+def build_manifest_path(downloads_dir):
+    return downloads_dir.parent / BUILD_MANIFEST_FILE
+
+def load_build_manifest(downloads_dir):
+    """Load the {platform/app_id: fingerprint} map from the last build"""
+    manifest_file = build_manifest_path(downloads_dir)
+    if not manifest_file.exists():
+        return {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('artifacts', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_build_manifest(downloads_dir, artifacts):
+    manifest_file = build_manifest_path(downloads_dir)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({'artifacts': artifacts}, f, indent=2, sort_keys=True)
+    record_write(manifest_file)
+
+def build_artifact(app_id, app_url, platform, downloads_dir, loose_files=True):
+    """Build one (app, platform) artifact, capturing its output
+
+    Returns (app_id, platform, output, error, spans) so results can be
+    reported in a fixed order whether the build ran in this process or a
+    worker; spans are the build's timings, for the parent's profiler.
+    """
+    output = io.StringIO()
+    error = None
+    profiler = BuildProfiler()
+    with contextlib.redirect_stdout(output), use_profiler(profiler):
+        try:
+            with span(f'create {platform}', app=app_id):
+                PLATFORM_BUILDERS[platform](app_id, app_url, downloads_dir, loose_files=loose_files)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return app_id, platform, output.getvalue(), error, [s.as_dict() for s in profiler.spans]
+
+def write_platform_indexes(downloads_dir, checksums):
+    """Write index.html and index.json (plus sidecars) into each platform directory
+
+    Static servers then serve these instead of listing the directory on
+    every request.
+    """
+    count = 0
+    for platform in ['windows', 'mac', 'linux']:
+        platform_dir = downloads_dir / platform
+        if not platform_dir.is_dir():
+            continue
+        entries = platform_index_entries(platform_dir, checksums)
+        for name, render_index in zip(PLATFORM_INDEX_FILES, (render_platform_index_html, render_platform_index_json)):
+            index_file = platform_dir / name
+            write_atomic(index_file, render_index(platform, entries))
+            for sidecar in write_compressed_sidecars(index_file):
+                record_write(sidecar)
+        count += len(entries)
     
-    print(f"✅ Created Linux AppImage for {app_name}")
+    print(f"📇 Wrote download indexes listing {count} files")
+    return count
+
+def create_all_executables(jobs=1, force=False, content_hash=False, loose_files=True, dedupe=False):
+    """Create executables for all apps
 
-def create_all_executables():
-    """Create executables for all apps"""
+    With jobs > 1 the (app, platform) builds fan out over a process pool.
+    Output is reported in APPS order either way. Artifacts whose inputs
+    match the build manifest and whose files still exist are skipped
+    unless force is set. With content_hash, every bundle also gets a
+    content-addressed name listed in asset-manifest.json. Without
+    loose_files only the bundles are written, not the .html/.bat/.sh copies.
+    With dedupe, identical files are hard-linked to a single stored copy.
+    Each platform directory gets a precomputed index.html and index.json.
+    """
     print("🚀 Creating executables for Cosmic App Store...")
     
     downloads_dir = create_directories()
+    previous = {} if force else load_build_manifest(downloads_dir)
+    generator_hash = generator_version()
     
+    artifacts = {}
+    fingerprints = {}
+    tasks = []
+    skipped = []
     for app_id, app_url in APPS.items():
-        app_name = app_id.replace('-', ' ').title()
+        for platform in PLATFORM_BUILDERS:
+            key = f'{platform}/{app_id}'
+            fingerprint = artifact_fingerprint(app_id, app_url, platform, generator_hash, loose_files)
+            outputs = artifact_outputs(app_id, platform, downloads_dir, loose_files)
+            outputs_exist = all(path.exists() for path in outputs)
+            if previous.get(key) == fingerprint and outputs_exist:
+                artifacts[key] = fingerprint
+                skipped.append(key)
+            else:
+                fingerprints[key] = fingerprint
+                tasks.append((app_id, app_url, platform, downloads_dir, loose_files))
+    
+    if skipped:
+        print(f"⏭️ Skipping {len(skipped)} up-to-date artifacts")
+    
+    with span('build artifacts', jobs=jobs, artifacts=len(tasks)):
+        if jobs > 1 and len(tasks) > 1:
+            print(f"⚙️ Building {len(tasks)} artifacts with {jobs} parallel jobs...")
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(build_artifact, *task) for task in tasks]
+                results = []
+                for task, future in zip(tasks, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # The worker itself died (e.g. it could not unpickle the task)
+                        results.append((task[0], task[2], '', f"{type(e).__name__}: {e}", []))
+        else:
+            results = [build_artifact(*task) for task in tasks]
         
-        try:
-            create_windows_executable(app_id, app_url, downloads_dir)
-            create_mac_app(app_id, app_url, downloads_dir)
-            create_linux_appimage(app_id, app_url, downloads_dir)
-        except Exception as e:
-            print(f"❌ Error creating executables for {app_name}: {e}")
+        failures = []
+        for app_id, platform, output, error, spans in results:
+            sys.stdout.write(output)
+            merge_spans(spans)
+            if error:
+                failures.append((app_id, platform, error))
+            else:
+                key = f'{platform}/{app_id}'
+                artifacts[key] = fingerprints[key]
+    
+    save_build_manifest(downloads_dir, artifacts)
+    print(f"📋 Built {len(tasks) - len(failures)}, skipped {len(skipped)}, failed {len(failures)}")
+    
+    if failures:
+        print(f"\n❌ {len(failures)} of {len(tasks)} artifacts failed:")
+        for app_id, platform, error in failures:
+            app_name = app_id.replace('-', ' ').title()
+            print(f"   {app_name} ({platform}): {error}")
+    
+    with span('compress'):
+        compress_text_artifacts(downloads_dir)
+    with span('checksums'):
+        checksums = write_checksums(downloads_dir)
+    
+    if dedupe:
+        with span('dedupe'):
+            if dedupe_artifacts(downloads_dir, checksums):
+                # Relinked files now carry the stored copy's mtime
+                checksums = write_checksums(downloads_dir)
+    else:
+        remove_blob_store(downloads_dir)
+    
+    if content_hash:
+        with span('content hash'):
+            bundles = [f'{platform}/{artifact_outputs(app_id, platform, downloads_dir)[-1].name}'
+                       for app_id in APPS for platform in PLATFORM_BUILDERS]
+            if write_content_hashed_names(downloads_dir, bundles, checksums):
+                # Cover the new names too; unchanged files are not re-hashed
+                checksums = write_checksums(downloads_dir)
+    
+    with span('indexes'):
+        write_platform_indexes(downloads_dir, checksums)
     
     print(f"\n🎉 All executables created in {downloads_dir}/")
     print("📁 Directory structure:")
@@ -261,45 +553,146 @@ def create_all_executables():
     
     # Create a simple web server script
     server_script = downloads_dir / 'start_server.py'
-    with open(server_script, 'w') as f:
-        f.write('''#!/usr/bin/env python3
+    write_atomic(server_script, '''#!/usr/bin/env python3
 """
 Simple HTTP server for Cosmic App Store downloads
 Run this to serve the downloads over HTTP
 """
 
 import http.server
-import socketserver
 import os
 from pathlib import Path
 
+from access_log import AccessLog, request_record
+
 PORT = 8080
 DIRECTORY = Path(__file__).parent
+# Kept-alive connections are closed after this long idle or this many requests
+KEEP_ALIVE_TIMEOUT = 5
+MAX_KEEP_ALIVE_REQUESTS = 100
+# JSON-lines request log, written by a background thread; kept next to
+# the downloads directory rather than in it so it isn't served
+ACCESS_LOG = AccessLog(DIRECTORY.parent / 'access.log')
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Reuse connections; every response here carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Otherwise a reused connection stalls on delayed ACKs between header and body writes
+    disable_nagle_algorithm = True
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(DIRECTORY), **kwargs)
     
+    def setup(self):
+        super().setup()
+        self.requests_handled = 0
+    
+    def handle_one_request(self):
+        self.connection_header_sent = False
+        # Idle timeout while waiting for the next request only, not during a download
+        self.connection.settimeout(KEEP_ALIVE_TIMEOUT)
+        try:
+            waiting = self.rfile.peek(1)
+        except (TimeoutError, ConnectionError):
+            waiting = b''
+        finally:
+            self.connection.settimeout(None)
+        if not waiting:
+            self.close_connection = True
+            return
+        self.requests_handled += 1
+        super().handle_one_request()
+    
+    def parse_request(self):
+        if not super().parse_request():
+            return False
+        if self.requests_handled >= MAX_KEEP_ALIVE_REQUESTS:
+            self.close_connection = True
+        return True
+    
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'connection':
+            self.connection_header_sent = True
+        super().send_header(keyword, value)
+    
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
+        if not self.connection_header_sent:
+            if self.close_connection:
+                self.send_header('Connection', 'close')
+            else:
+                if self.request_version == 'HTTP/1.0':
+                    self.send_header('Connection', 'keep-alive')
+                self.send_header('Keep-Alive', f'timeout={KEEP_ALIVE_TIMEOUT}, '
+                                               f'max={MAX_KEEP_ALIVE_REQUESTS - self.requests_handled}')
         super().end_headers()
 
+    def log_request(self, code='-', size='-'):
+        if isinstance(code, int):
+            ACCESS_LOG.log(request_record(self, code))
+
+    def log_message(self, format, *args):
+        ACCESS_LOG.log({'client': self.client_address[0], 'message': format % args})
+
+    def copyfile(self, source, outputfile):
+        # Zero-copy transfer via sendfile(); socket.sendfile() falls back
+        # to send() on its own where the OS lacks it
+        if hasattr(os, 'sendfile') and outputfile is self.wfile:
+            try:
+                source.fileno()
+            except (AttributeError, OSError, ValueError):
+                pass
+            else:
+                self.connection.sendfile(source)
+                return
+        super().copyfile(source, outputfile)
+
 if __name__ == "__main__":
     os.chdir(DIRECTORY)
+    ACCESS_LOG.start()
     
-    with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
+    # One thread per connection, so an idle kept-alive client blocks nobody
+    with http.server.ThreadingHTTPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
         print(f"🌐 Download server running at http://localhost:{PORT}")
         print(f"📁 Serving files from: {DIRECTORY}")
+        print(f"📝 Access log: {ACCESS_LOG.path}")
         print("Press Ctrl+C to stop the server")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\\n👋 Server stopped")
+        finally:
+            ACCESS_LOG.close()
 ''')
     
+    # The server script imports its access log writer from alongside it
+    copy_atomic(Path(__file__).with_name('access_log.py'), downloads_dir / 'access_log.py')
+    
     print(f"\n🌐 To serve downloads over HTTP, run:")
     print(f"   python {server_script}")
     print(f"   Then access: http://localhost:8080")
+    
+    return failures
 
 if __name__ == "__main__":
-    create_all_executables() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create executables for all apps in the Cosmic App Store")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of parallel build processes (default: CPU count, 1 = serial)")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild every artifact even if its inputs are unchanged")
+    parser.add_argument('--content-hash', action='store_true',
+                        help="also publish bundles under content-hashed names (see asset-manifest.json)")
+    parser.add_argument('--no-loose-files', dest='loose_files', action='store_false',
+                        help="only write the bundles, not the loose .html/.bat/.sh copies next to them")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="hard-link identical artifacts to one copy in downloads/.blobs")
+    parser.add_argument('--profile', nargs='?', const=build_profiler.DEFAULT_REPORT_FILE, metavar='REPORT',
+                        help=f"time each step and write a JSON report (default: {build_profiler.DEFAULT_REPORT_FILE})")
+    args = parser.parse_args()
+    
+    failures = create_all_executables(jobs=args.jobs, force=args.force, content_hash=args.content_hash,
+                                      loose_files=args.loose_files, dedupe=args.dedupe)
+    if args.profile:
+        build_profiler.active.print_summary()
+        build_profiler.active.write_report(args.profile)
+    sys.exit(1 if failures else 0) 
\ No newline at end of file
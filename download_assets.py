@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Download Assets for Cosmic App Store
+Compressed sidecars and platform indexes, shared by the generator and the servers
+"""
+
+import gzip
+import html
+import json
+import os
+import urllib.parse
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content hashes of every artifact, written by create_executables and read
+# by the download server for ETags
+CHECKSUMS_FILE = 'checksums.json'
+
+# Logical bundle name -> content-hashed name, for immutable caching
+ASSET_MANIFEST_FILE = 'asset-manifest.json'
+
+def replace_file(path, data, mode=None):
+    """Write data to path via a temporary file and rename
+
+    Replacing rather than rewriting in place means readers never see a
+    partial file and hard links to the old content are left untouched.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+# Text artifacts that get precompressed .gz/.br sidecars for the download server
+COMPRESSIBLE_SUFFIXES = ('.html', '.htm', '.bat', '.sh', '.py', '.txt', '.json', '.css', '.js', '.svg')
+
+def write_compressed_sidecars(path):
+    """Write .gz (and .br when brotli is installed) copies next to a text file"""
+    path = Path(path)
+    data = path.read_bytes()
+    written = []
+    
+    # mtime=0 keeps the gzip output identical for identical input
+    gz_file = path.with_name(path.name + '.gz')
+    replace_file(gz_file, gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_file)
+    
+    if brotli is not None:
+        br_file = path.with_name(path.name + '.br')
+        replace_file(br_file, brotli.compress(data, mode=brotli.MODE_TEXT, quality=11))
+        written.append(br_file)
+    
+    return written
+
+def sidecars_are_fresh(path):
+    """True if every sidecar for path exists and is no older than it"""
+    suffixes = ['.gz', '.br'] if brotli is not None else ['.gz']
+    source_mtime = path.stat().st_mtime_ns
+    for suffix in suffixes:
+        sidecar = path.with_name(path.name + suffix)
+        if not sidecar.exists() or sidecar.stat().st_mtime_ns < source_mtime:
+            return False
+    return True
+
+# Precomputed listing of each platform directory, served instead of a
+# generated directory listing
+PLATFORM_INDEX_FILES = ('index.html', 'index.json')
+
+def is_platform_index_file(name):
+    """True for a platform index or one of its compressed sidecars"""
+    return any(name == index or name.startswith(index + '.') for index in PLATFORM_INDEX_FILES)
+
+def platform_index_entries(platform_dir, checksums):
+    """Files listed in a platform's index, sorted by name
+
+    Compressed sidecars and the index files themselves are left out. Hashes
+    come from checksums (keyed like checksums.json) when its size and mtime
+    still match the file; otherwise sha256 is None.
+    """
+    platform_dir = Path(platform_dir)
+    platform = platform_dir.name
+    entries = []
+    with os.scandir(platform_dir) as it:
+        names = {entry.name: entry for entry in it if entry.is_file() and not entry.name.startswith('.')}
+    for name in sorted(names):
+        if is_platform_index_file(name):
+            continue
+        base, suffix = os.path.splitext(name)
+        if suffix in ('.gz', '.br') and base in names:
+            continue
+        stat = names[name].stat()
+        checksum = checksums.get(f'{platform}/{name}')
+        if checksum and checksum.get('size') == stat.st_size and checksum.get('mtime_ns') == stat.st_mtime_ns:
+            sha256 = checksum['sha256']
+        else:
+            sha256 = None
+        entries.append({
+            'name': name,
+            'size': stat.st_size,
+            'mtime': datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(timespec='seconds'),
+            'sha256': sha256
+        })
+    return entries
+
+def render_platform_index_json(platform, entries):
+    return (json.dumps({'platform': platform, 'files': entries}, indent=2) + '\n').encode('utf-8')
+
+def render_platform_index_html(platform, entries):
+    title = html.escape(f'Cosmic App Store - {platform.title()} Downloads')
+    rows = ''.join(f'''
+            <tr>
+                <td><a href="{urllib.parse.quote(entry['name'])}">{html.escape(entry['name'])}</a></td>
+                <td class="size">{entry['size'] / 1024:.1f} KB</td>
+                <td>{entry['mtime'].replace('T', ' ').replace('+00:00', ' UTC')}</td>
+                <td class="hash" title="{entry['sha256'] or ''}">{(entry['sha256'] or '-')[:12]}</td>
+            </tr>''' for entry in entries)
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; background: #0a0a0a; color: #fff; }}
+        a {{ color: #00ffff; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ padding: 6px 16px; text-align: left; border-bottom: 1px solid #333; }}
+        .size {{ text-align: right; }}
+        .hash {{ font-family: monospace; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <p><a href="../">All downloads</a> · <a href="index.json">index.json</a></p>
+    <table>
+        <tr><th>File</th><th>Size</th><th>Modified</th><th>SHA-256</th></tr>{rows}
+    </table>
+</body>
+</html>
+'''.encode('utf-8')
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Launcher Templates for Cosmic App Store
+Compiled HTML, launcher and README templates shared by the executable generators
+"""
+
+from functools import lru_cache
+from string import Template
+
+# Store-wide web app wrapper (create_executables.py)
+
+STORE_HTML = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>${app_name} - Cosmic App Store</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            font-family: Arial, sans-serif;
+            background: #0a0a12;
+            color: #00f7ff;
+            overflow: hidden;
+        }
+        .app-frame {
+            width: 100vw;
+            height: 100vh;
+            border: none;
+            background: white;
+        }
+        .loading {
+            position: fixed;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            font-size: 18px;
+            color: #00f7ff;
+        }
+    </style>
+</head>
+<body>
+    <div class="loading" id="loading">Loading ${app_name}...</div>
+    <iframe src="${app_url}" class="app-frame" id="appFrame" onload="hideLoading()"></iframe>
+    
+    <script>
+        function hideLoading() {
+            document.getElementById('loading').style.display = 'none';
+        }
+    </script>
+</body>
+</html>''')
+
+STORE_WINDOWS_LAUNCHER = Template('''@echo off
+title ${app_name} - Cosmic App Store
+echo Starting ${app_name}...
+start "" "${app_url}"
+pause''')
+
+STORE_WINDOWS_README = Template('''${app_name} - Cosmic App Store
+
+This is a web app wrapper for ${app_name}.
+To run this app:
+1. Extract this file
+2. Run launcher.bat or open app.html in your browser
+3. The app will open in your default web browser
+
+Original URL: ${app_url}
+
+Created by Cosmos Coderr - Cosmic App Store
+''')
+
+STORE_MAC_LAUNCHER = Template('''#!/bin/bash
+# ${app_name} - Cosmic App Store Launcher
+echo "Starting ${app_name}..."
+open "${app_url}"
+''')
+
+STORE_LINUX_LAUNCHER = Template('''#!/bin/bash
+# ${app_name} - Cosmic App Store Launcher
+echo "Starting ${app_name}..."
+xdg-open "${app_url}" 2>/dev/null || sensible-browser "${app_url}" 2>/dev/null || x-www-browser "${app_url}" 2>/dev/null || firefox "${app_url}" 2>/dev/null || chromium-browser "${app_url}" 2>/dev/null || google-chrome "${app_url}" 2>/dev/null || echo "Please open ${app_url} in your browser"
+''')
+
+STORE_UNIX_README = Template('''${app_name} - Cosmic App Store
+
+This is a web app wrapper for ${app_name}.
+To run this app:
+1. Extract this file
+2. Run: chmod +x launcher.sh && ./launcher.sh
+3. Or open app.html in your browser
+4. The app will open in your default web browser
+
+Original URL: ${app_url}
+
+Created by Cosmos Coderr - Cosmic App Store
+''')
+
+# Akan Wise Saying desktop launcher (akan_simple_generator.py, SimpleExecutableGenerator)
+
+AKAN_HTML = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>${app_name} - True Wisdom</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            font-family: Arial, sans-serif;
+            background: #0a0a12;
+            color: #00f7ff;
+            overflow: hidden;
+            display: flex;
+            flex-direction: column;
+            height: 100vh;
+        }
+        .header {
+            background: linear-gradient(135deg, rgba(30, 30, 61, 0.9), rgba(10, 10, 18, 0.9));
+            padding: 1rem;
+            text-align: center;
+            border-bottom: 1px solid rgba(0, 247, 255, 0.2);
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 1.5rem;
+            background: linear-gradient(90deg, #00f7ff, #ff00f7);
+            -webkit-background-clip: text;
+            background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        .app-frame {
+            flex: 1;
+            width: 100%;
+            border: none;
+            background: white;
+        }
+        .loading {
+            position: fixed;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            font-size: 18px;
+            color: #00f7ff;
+            z-index: 1000;
+        }
+        .loading.hidden {
+            display: none;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🌟 ${app_name} - True Wisdom</h1>
+    </div>
+    
+    <div class="loading" id="loading">
+        <div>Loading Akan Wisdom...</div>
+        <div style="font-size: 12px; margin-top: 10px;">Opening ${web_url}</div>
+    </div>
+    
+    <iframe src="${web_url}" class="app-frame" id="appFrame" onload="hideLoading()"></iframe>
+    
+    <script>
+        function hideLoading() {
+            document.getElementById('loading').classList.add('hidden');
+        }
+        
+        setTimeout(() => {
+            document.getElementById('loading').classList.add('hidden');
+        }, 3000);
+    </script>
+</body>
+</html>''')
+
+AKAN_WINDOWS_LAUNCHER = Template('''@echo off
+title ${app_name} - True Wisdom
+color 0b
+
+echo.
+echo    ╔══════════════════════════════════════════════════════════╗
+echo    ║                    AKAN WISE SAYING                     ║
+echo    ║                     True Wisdom                          ║
+echo    ╚══════════════════════════════════════════════════════════╝
+echo.
+echo    Opening Akan Wise Saying in your browser...
+echo.
+echo    URL: ${web_url}
+echo.
+
+start "" "${web_url}"
+
+echo    ✅ App opened successfully!
+echo.
+echo    If the browser doesn't open automatically, please visit:
+echo    ${web_url}
+echo.
+pause
+''')
+
+AKAN_SHELL_LAUNCHER = Template('''#!/bin/bash
+
+# ${app_name} - Desktop Launcher
+# Opens the Akan Wise Saying web app in the default browser
+
+echo "🌟 ${app_name} - True Wisdom"
+echo "=================================================="
+echo "Opening ${app_name} in your browser..."
+echo "URL: ${web_url}"
+echo "=================================================="
+
+# Try different commands to open the browser
+if command -v xdg-open >/dev/null 2>&1; then
+    xdg-open "${web_url}"
+elif command -v sensible-browser >/dev/null 2>&1; then
+    sensible-browser "${web_url}"
+elif command -v x-www-browser >/dev/null 2>&1; then
+    x-www-browser "${web_url}"
+elif command -v firefox >/dev/null 2>&1; then
+    firefox "${web_url}"
+elif command -v chromium-browser >/dev/null 2>&1; then
+    chromium-browser "${web_url}"
+elif command -v google-chrome >/dev/null 2>&1; then
+    google-chrome "${web_url}"
+else
+    echo "❌ No suitable browser found."
+    echo "Please manually visit: ${web_url}"
+    read -p "Press Enter to exit..."
+    exit 1
+fi
+
+echo "✅ App opened successfully!"
+echo ""
+read -p "Press Enter to close this launcher..."
+''')
+
+AKAN_PYTHON_LAUNCHER = Template('''#!/usr/bin/env python3
+"""
+${app_name} - Desktop Launcher
+Opens the Akan Wise Saying web app in the default browser
+"""
+
+import webbrowser
+import sys
+import os
+from pathlib import Path
+
+def main():
+    """Main function to launch the Akan Wise Saying app"""
+    app_url = "${web_url}"
+    
+    print("🌟 Akan Wise Saying - True Wisdom")
+    print("=" * 50)
+    print("Opening Akan Wise Saying in your browser...")
+    print(f"URL: {app_url}")
+    print("=" * 50)
+    
+    try:
+        # Open the web app in the default browser
+        webbrowser.open(app_url)
+        print("✅ App opened successfully!")
+        
+        # Keep the window open for a moment
+        input("\\nPress Enter to close this launcher...")
+        
+    except Exception as e:
+        print(f"❌ Error opening app: {e}")
+        print("\\nPlease manually visit:")
+        print(f"{app_url}")
+        input("\\nPress Enter to exit...")
+
+if __name__ == "__main__":
+    main()
+''')
+
+AKAN_README = Template('''${app_name} - True Wisdom
+
+This is a desktop launcher for ${app_name}.
+
+To run this app:
+1. Extract this file to a folder
+${run_steps}
+
+The app will open in your default web browser.
+
+Original URL: ${web_url}
+
+Features:
+- 🌟 Beautiful cosmic-themed interface
+- 💡 Ancient Akan wisdom and proverbs
+- ❤️ Save your favorite quotes
+- 📤 Share wisdom with others
+- 🎨 Responsive design for all devices
+
+Created by Cosmos Coderr - Cosmic App Store
+''')
+
+TEMPLATES = {
+    'store-html': STORE_HTML,
+    'store-windows-launcher': STORE_WINDOWS_LAUNCHER,
+    'store-windows-readme': STORE_WINDOWS_README,
+    'store-mac-launcher': STORE_MAC_LAUNCHER,
+    'store-linux-launcher': STORE_LINUX_LAUNCHER,
+    'store-unix-readme': STORE_UNIX_README,
+    'akan-html': AKAN_HTML,
+    'akan-windows-launcher': AKAN_WINDOWS_LAUNCHER,
+    'akan-shell-launcher': AKAN_SHELL_LAUNCHER,
+    'akan-python-launcher': AKAN_PYTHON_LAUNCHER,
+    'akan-readme': AKAN_README
+}
+
+def akan_run_steps(platform, python_launcher=False):
+    """The numbered "how to run" steps after "1. Extract" in the Akan README"""
+    if platform == 'windows':
+        steps = ["Double-click launcher.bat to open the app"]
+    else:
+        steps = ["Run: chmod +x launcher.sh && ./launcher.sh"]
+    if python_launcher:
+        steps.append("Or run: python launcher.py")
+    steps.append("Or open app.html in your browser")
+    return '\n'.join(f"{number}. {step}" for number, step in enumerate(steps, start=2))
+
+@lru_cache(maxsize=4096)
+def _render(name, context):
+    return TEMPLATES[name].substitute(dict(context))
+
+def render(name, **context):
+    """Render a named template, memoized per (template, context)
+
+    The same app renders its HTML wrapper once and reuses it for every
+    platform instead of re-formatting it per bundle.
+    """
+    return _render(name, tuple(sorted(context.items())))
+
+def render_cache_info():
+    return _render.cache_info()
@@ -4,58 +4,1430 @@ Local Download Server for Cosmic App Store
 Serves executable files directly from the downloads directory
 """
 
+import argparse
 import http.server
 import socketserver
 import os
+import shutil
+import bisect
+import datetime
+import email.utils
+import functools
+import gzip
+import hashlib
+import io
+import json
+import math
+import mmap
+import socket
+import uuid
 import webbrowser
+from http import HTTPStatus
 from pathlib import Path
 import threading
 import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from access_log import AccessLog, request_record
+from download_assets import (ASSET_MANIFEST_FILE, CHECKSUMS_FILE, COMPRESSIBLE_SUFFIXES, PLATFORM_INDEX_FILES,
+                             platform_index_entries, render_platform_index_html, render_platform_index_json,
+                             replace_file, write_compressed_sidecars)
+
+SERVER_MODES = ("single", "threaded")
+
+# Precompressed sidecar suffixes, in order of preference
+SIDECAR_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def parse_accept_encoding(value):
+    """Parse an Accept-Encoding header into {coding: qvalue}"""
+    accepted = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, val = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+# More ranges than this in one request is treated as abuse and ignored
+MAX_RANGES = 16
+
+def parse_range_header(value, size):
+    """Parse a bytes Range header into a list of (start, end) pairs, end inclusive
+
+    Returns None when the header is malformed (the Range is then ignored and
+    the full file served) and [] when no range is satisfiable.
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        first, last = first.strip(), last.strip()
+        if not sep or not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+            return None
+        if first == "":
+            if last == "":
+                return None
+            # Suffix range: the final N bytes
+            length = int(last)
+            if length == 0 or size == 0:
+                # An empty file has no final bytes to send
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            continue
+        end = int(last) if last else size - 1
+        ranges.append((start, min(end, size - 1)))
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+# Content-hashed names never change content, so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Prometheus text-format endpoint
+METRICS_PATH = "/metrics"
+PLATFORMS = ("windows", "mac", "linux")
+# Upper bounds in seconds; downloads of large bundles can take a while
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+class ChecksumIndex:
+    """Strong ETags for the downloads tree, keyed by path relative to it
+
+    Hashes come from checksums.json when its recorded size and mtime still
+    match the file; anything else is hashed once on first request and kept.
+    """
+
+    def __init__(self, downloads_dir):
+        self.checksums_file = Path(downloads_dir).absolute() / CHECKSUMS_FILE
+        self.entries = {}
+        self.loaded_mtime = None
+        self.computed = {}
+        self.lock = threading.Lock()
+
+    def reload(self):
+        """Re-read checksums.json if it changed since the last load"""
+        try:
+            mtime = self.checksums_file.stat().st_mtime_ns
+        except OSError:
+            self.entries = {}
+            self.loaded_mtime = None
+            return
+        if mtime == self.loaded_mtime:
+            return
+        try:
+            with open(self.checksums_file, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.loaded_mtime = mtime
+
+    def etag_for(self, rel_path, fs, f):
+        """Return the quoted ETag for an open file"""
+        with self.lock:
+            self.reload()
+            entry = self.entries.get(rel_path)
+            if entry and entry.get("size") == fs.st_size and entry.get("mtime_ns") == fs.st_mtime_ns:
+                return f'"{entry["sha256"]}"'
+            key = (rel_path, fs.st_size, fs.st_mtime_ns)
+            digest = self.computed.get(key)
+        if digest is None:
+            digest = file_sha256(f)
+            with self.lock:
+                self.computed[key] = digest
+        return f'"{digest}"'
+
+class ImmutableAssets:
+    """The set of content-hashed bundle names listed in asset-manifest.json"""
+
+    def __init__(self, downloads_dir):
+        self.manifest_file = Path(downloads_dir).absolute() / ASSET_MANIFEST_FILE
+        self.names = frozenset()
+        self.loaded_mtime = None
+        self.lock = threading.Lock()
+
+    def __contains__(self, rel_path):
+        with self.lock:
+            try:
+                mtime = self.manifest_file.stat().st_mtime_ns
+            except OSError:
+                self.names, self.loaded_mtime = frozenset(), None
+                return False
+            if mtime != self.loaded_mtime:
+                try:
+                    with open(self.manifest_file, "r", encoding="utf-8") as f:
+                        self.names = frozenset(json.load(f).values())
+                except (OSError, ValueError, AttributeError):
+                    self.names = frozenset()
+                self.loaded_mtime = mtime
+            return rel_path in self.names
+
+class IndexPage:
+    """One rendered platform index, with its gzip copy and an ETag for each"""
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.gzip_body = gzip.compress(body, mtime=0)
+        self.content_type = content_type
+        # Strong validators must differ between content-codings
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        self.gzip_etag = f'"{hashlib.sha256(self.gzip_body).hexdigest()}"'
+
+class PlatformIndexes:
+    """index.html/index.json for each platform directory, kept in memory
+
+    A platform's pages are rebuilt when its directory's mtime (files added,
+    removed or replaced) or checksums.json changes, and are otherwise
+    served without touching the directory.
+    """
+
+    def __init__(self, downloads_dir, checksums):
+        self.downloads_dir = Path(downloads_dir).absolute()
+        self.checksums = checksums
+        self.pages = {}
+        self.rebuilds = 0
+        self.lock = threading.Lock()
+
+    def get(self, platform, name):
+        """Return the IndexPage for platform's index file name, or None"""
+        platform_dir = self.downloads_dir / platform
+        try:
+            dir_mtime = platform_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self.checksums.lock:
+            self.checksums.reload()
+            checksums, checksums_mtime = self.checksums.entries, self.checksums.loaded_mtime
+        # Taken before the scan, so a change made during it triggers another rebuild
+        validator = (dir_mtime, checksums_mtime)
+        with self.lock:
+            cached = self.pages.get(platform)
+        if cached is None or cached[0] != validator:
+            try:
+                entries = platform_index_entries(platform_dir, checksums)
+            except OSError:
+                return None
+            pages = {
+                "index.html": IndexPage(render_platform_index_html(platform, entries), "text/html; charset=utf-8"),
+                "index.json": IndexPage(render_platform_index_json(platform, entries), "application/json"),
+            }
+            cached = (validator, pages)
+            with self.lock:
+                self.pages[platform] = cached
+                self.rebuilds += 1
+        return cached[1].get(name)
+
+def file_sha256(f):
+    """Hash an open binary file, leaving its position unchanged"""
+    digest = hashlib.sha256()
+    position = f.tell()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        digest.update(chunk)
+    f.seek(position)
+    return digest.hexdigest()
+
+class HotFileCache:
+    """Size-bounded LRU cache of file contents for the hottest downloads
+
+    Entries are keyed by path and validated against the inode, size and
+    mtime from a fresh stat(), so a rebuilt artifact is never served stale.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_file_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def validator(fs):
+        return (fs.st_ino, fs.st_size, fs.st_mtime_ns)
+
+    def get(self, path, fs):
+        """Return cached bytes for path if they still match fs, else None"""
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == self.validator(fs):
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.current_bytes -= len(entry[1])
+                del self.entries[path]
+            self.misses += 1
+            return None
+
+    def put(self, path, fs, data):
+        """Cache data for path, evicting least recently used files to fit"""
+        if len(data) > self.max_file_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.current_bytes -= len(old[1])
+            while self.entries and self.current_bytes + len(data) > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+            self.entries[path] = (self.validator(fs), data)
+            self.current_bytes += len(data)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(self.entries),
+                "bytes": self.current_bytes,
+            }
+
+class MappedFile:
+    """Read-only file object over a shared mmap, handing out zero-copy slices"""
+
+    def __init__(self, mapping):
+        self.view = memoryview(mapping)
+        self.position = 0
+
+    def slice(self, offset, count=None):
+        end = len(self.view) if count is None else min(offset + count, len(self.view))
+        return self.view[offset:end]
+
+    def read(self, size=-1):
+        end = len(self.view) if size is None or size < 0 else self.position + size
+        data = bytes(self.view[self.position:end])
+        self.position += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += len(self.view)
+        self.position = max(offset, 0)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def fileno(self):
+        raise io.UnsupportedOperation("fileno")
+
+    def close(self):
+        self.view.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class MappedFileRegistry:
+    """Shares one read-only mmap per large file across concurrent Range requests
+
+    Whole-file responses skip it, since sendfile() already sends those
+    straight from the page cache.
+
+    Files served this way must be replaced (write + rename) rather than
+    rewritten in place, since truncating a mapped file under an in-flight
+    transfer faults the reader. The generators do so through
+    bundle_writer's BundleWriter, write_atomic() and copy_atomic().
+    """
+
+    def __init__(self, threshold=32 * 1024 * 1024):
+        self.threshold = threshold
+        self.maps = {}
+        self.lock = threading.Lock()
+
+    def open(self, path, fs):
+        """Return a MappedFile for path, remapping if the file changed"""
+        validator = HotFileCache.validator(fs)
+        with self.lock:
+            entry = self.maps.get(path)
+            if entry is None or entry[0] != validator:
+                with open(path, "rb") as f:
+                    fs = os.fstat(f.fileno())
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                # A replaced mapping is unmapped once its last view is released
+                entry = (HotFileCache.validator(fs), mapping)
+                self.maps[path] = entry
+            return MappedFile(entry[1])
+
+class TransferTracker:
+    """Requests in flight, so a drain can wait for them and report stragglers
+
+    Also knows every open connection, so a drain can close kept-alive
+    connections that are only waiting for their next request.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.active = {}
+        self.connections = set()
+        self.next_id = 0
+        self.draining = False
+
+    def connect(self, handler):
+        with self.condition:
+            self.connections.add(handler)
+
+    def disconnect(self, handler):
+        with self.condition:
+            self.connections.discard(handler)
+
+    def close_idle(self):
+        """Shut down connections with no request in flight"""
+        with self.condition:
+            busy = {handler for handler, _ in self.active.values()}
+            idle = [handler for handler in self.connections if handler not in busy]
+        for handler in idle:
+            try:
+                handler.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def begin(self, handler):
+        """Register a request; returns None once draining has started"""
+        with self.condition:
+            if self.draining:
+                return None
+            self.next_id += 1
+            self.active[self.next_id] = (handler, time.monotonic())
+            return self.next_id
+
+    def end(self, token):
+        with self.condition:
+            self.active.pop(token, None)
+            self.condition.notify_all()
+
+    def start_draining(self):
+        with self.condition:
+            self.draining = True
+
+    def wait_idle(self, timeout):
+        """Wait until nothing is in flight; returns False on timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.active, timeout)
+
+    def interrupt_all(self):
+        """Cut off every request still in flight; returns what was cut off"""
+        with self.condition:
+            active = list(self.active.values())
+        now = time.monotonic()
+        interrupted = []
+        for handler, started in active:
+            interrupted.append({
+                "client": handler.client_address[0],
+                "request": handler.requestline,
+                "seconds": round(now - started, 3),
+            })
+            try:
+                handler.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return interrupted
+
+class TokenBucket:
+    """Refills at rate tokens per second, holding at most burst tokens"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now, amount=1):
+        """Take amount if available; otherwise return seconds until it would be"""
+        self.refill(now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, now, amount):
+        """Take amount, going into debt if need be; returns seconds to wait it off"""
+        self.refill(now)
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+class ClientRateLimiter:
+    """Per-client-IP request-rate and bandwidth token buckets
+
+    A client over its request rate is told when to retry; one over its
+    bandwidth is slowed down by pacing its transfers. All connections
+    from one IP share that IP's buckets.
+
+    A paced transfer holds a worker thread while it sleeps, so a client
+    with bandwidth limits also gets at most max_transfers requests in
+    flight at once; the rest are told to retry.
+    """
+
+    # Forget clients idle this long (checked every PRUNE_EVERY requests)
+    IDLE_SECONDS = 600
+    PRUNE_EVERY = 1024
+    DEFAULT_MAX_TRANSFERS = 2
+
+    def __init__(self, requests_per_second=None, request_burst=None,
+                 bytes_per_second=None, byte_burst=None, max_transfers=None):
+        self.requests_per_second = requests_per_second
+        self.request_burst = request_burst or max(1, math.ceil(requests_per_second or 1))
+        self.bytes_per_second = bytes_per_second
+        # One second's worth by default, so short transfers aren't paced at all
+        self.byte_burst = byte_burst or bytes_per_second
+        self.max_transfers = None
+        if bytes_per_second:
+            self.max_transfers = max_transfers or self.DEFAULT_MAX_TRANSFERS
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.requests_seen = 0
+
+    def client(self, ip, now):
+        entry = self.clients.get(ip)
+        if entry is None:
+            entry = self.clients[ip] = [
+                TokenBucket(self.requests_per_second, self.request_burst) if self.requests_per_second else None,
+                TokenBucket(self.bytes_per_second, self.byte_burst) if self.bytes_per_second else None,
+                now,
+                0,  # requests in flight
+            ]
+        entry[2] = now
+        return entry
+
+    def admit(self, ip):
+        """Count a request; returns 0 if allowed, else seconds until it would be"""
+        now = time.monotonic()
+        with self.lock:
+            self.requests_seen += 1
+            if self.requests_seen % self.PRUNE_EVERY == 0:
+                idle = [key for key, entry in self.clients.items()
+                        if now - entry[2] > self.IDLE_SECONDS and not entry[3]]
+                for key in idle:
+                    del self.clients[key]
+            bucket = self.client(ip, now)[0]
+            return bucket.try_take(now) if bucket else 0.0
+
+    def throttle(self, ip, nbytes):
+        """Account for nbytes about to be sent; returns seconds to sleep first"""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.client(ip, now)[1]
+            return bucket.take(now, nbytes) if bucket else 0.0
+
+    def begin_transfer(self, ip):
+        """Claim one of the client's in-flight slots; False if they are all taken"""
+        if not self.max_transfers:
+            return True
+        with self.lock:
+            entry = self.client(ip, time.monotonic())
+            if entry[3] >= self.max_transfers:
+                return False
+            entry[3] += 1
+            return True
+
+    def end_transfer(self, ip):
+        if not self.max_transfers:
+            return
+        with self.lock:
+            entry = self.clients.get(ip)
+            if entry is not None:
+                entry[3] -= 1
+
+def prometheus_labels(**labels):
+    """Format labels as {name="value",...}, escaped per the text exposition format"""
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+class ServerMetrics:
+    """Request counters and latency histograms for the /metrics endpoint
+
+    Every thread counts into its own shard without taking a lock; a scrape
+    sums the shards. Copying a dict is atomic under the GIL, so a scrape
+    never sees one half-updated.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.shards_lock = threading.Lock()
+
+    def shard(self):
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = {"requests": {}, "bytes": {}, "latency": {}}
+            with self.shards_lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+        return shard
+
+    def observe(self, path, method, status, nbytes, seconds):
+        """Count a request; path is what it resolved to ("/windows/x.exe") or "other"
+
+        Callers pass only resolved, existing paths so label cardinality
+        stays bounded by the downloads tree.
+        """
+        first = path.lstrip("/").split("/", 1)[0]
+        platform = first if first in PLATFORMS else "other"
+        if status is None or status >= 400:
+            path = "other"
+        status = status or 0
+
+        shard = self.shard()
+        requests = shard["requests"]
+        key = (path, platform, method, status)
+        requests[key] = requests.get(key, 0) + 1
+        sent = shard["bytes"]
+        sent[(path, platform)] = sent.get((path, platform), 0) + nbytes
+        histogram = shard["latency"].get(platform)
+        if histogram is None:
+            # Per-bucket counts (the last is +Inf), then the sum of latencies
+            histogram = shard["latency"][platform] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+    def render(self, in_flight):
+        """Current totals in the Prometheus text exposition format"""
+        requests, sent, latency = {}, {}, {}
+        with self.shards_lock:
+            shards = list(self.shards)
+        for shard in shards:
+            for key, value in shard["requests"].copy().items():
+                requests[key] = requests.get(key, 0) + value
+            for key, value in shard["bytes"].copy().items():
+                sent[key] = sent.get(key, 0) + value
+            for platform, histogram in shard["latency"].copy().items():
+                total = latency.setdefault(platform, [0] * len(histogram[:-1]) + [0.0])
+                for i, value in enumerate(histogram):
+                    total[i] += value
+
+        lines = [
+            "# HELP download_requests_total Requests served, by path, platform, method and status.",
+            "# TYPE download_requests_total counter",
+        ]
+        for (path, platform, method, status), value in sorted(requests.items()):
+            labels = prometheus_labels(path=path, platform=platform, method=method, status=status)
+            lines.append(f"download_requests_total{labels} {value}")
+        lines += [
+            "# HELP download_bytes_sent_total Response body bytes sent, by path and platform.",
+            "# TYPE download_bytes_sent_total counter",
+        ]
+        for (path, platform), value in sorted(sent.items()):
+            lines.append(f"download_bytes_sent_total{prometheus_labels(path=path, platform=platform)} {value}")
+        lines += [
+            "# HELP download_in_flight_transfers Requests currently being served.",
+            "# TYPE download_in_flight_transfers gauge",
+            f"download_in_flight_transfers {in_flight}",
+            "# HELP download_request_duration_seconds Time to serve a request, by platform.",
+            "# TYPE download_request_duration_seconds histogram",
+        ]
+        for platform, histogram in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                labels = prometheus_labels(platform=platform, le=bound)
+                lines.append(f"download_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = prometheus_labels(platform=platform)
+            lines.append(f"download_request_duration_seconds_sum{labels} {histogram[-1]:.6f}")
+            lines.append(f"download_request_duration_seconds_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+class DownloadRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Request handler for the downloads tree
+
+    Speaks HTTP/1.1, so a connection is reused for further requests until
+    it has been idle for the server's keep_alive_timeout or has served
+    max_keep_alive_requests requests.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, a reused
+    # connection waits out the client's delayed ACK between them
+    disable_nagle_algorithm = True
+
+    # Hand regular files to the kernel with sendfile(); socket.sendfile()
+    # falls back to a plain send() loop where the OS doesn't support it
+    use_sendfile = hasattr(os, "sendfile")
+
+    # Defaults when the server doesn't set its own
+    keep_alive_timeout = 5
+    max_keep_alive_requests = 100
+    # How often an idle connection checks whether others are queued
+    idle_poll_interval = 0.1
+
+    def setup(self):
+        super().setup()
+        self.requests_handled = 0
+        self.keep_alive_timeout = getattr(self.server, "keep_alive_timeout", self.keep_alive_timeout)
+        self.max_keep_alive_requests = getattr(self.server, "max_keep_alive_requests",
+                                               self.max_keep_alive_requests)
+        transfers = getattr(self.server, "transfers", None)
+        if transfers is not None:
+            transfers.connect(self)
+
+    def finish(self):
+        transfers = getattr(self.server, "transfers", None)
+        if transfers is not None:
+            transfers.disconnect(self)
+        super().finish()
+
+    def handle_one_request(self):
+        """Wait up to keep_alive_timeout for the next request, then handle it"""
+        self.connection_header_sent = False
+        if not self.wait_for_request():
+            # Idle timeout, a queued connection needs the worker, or the
+            # client hung up: close quietly
+            self.close_connection = True
+            return
+        self.requests_handled += 1
+        super().handle_one_request()
+
+    def wait_for_request(self):
+        """True once request bytes are available, False to close the connection
+
+        Waits in idle_poll_interval slices and gives up early while other
+        connections are queued for a worker, so idle keep-alive clients
+        can't starve new ones.
+        """
+        try:
+            # A request already buffered (pipelined) never reaches the socket;
+            # a non-blocking peek returns it without a raw read
+            self.connection.settimeout(0)
+            if self.rfile.peek(1):
+                return True
+            deadline = time.monotonic() + self.keep_alive_timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                # Raw MSG_PEEK on the socket: a timeout here, unlike one on
+                # rfile, leaves the connection readable afterwards
+                self.connection.settimeout(min(remaining, self.idle_poll_interval))
+                try:
+                    return bool(self.connection.recv(1, socket.MSG_PEEK))
+                except TimeoutError:
+                    if getattr(self.server, "connections_waiting", 0):
+                        return False
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def parse_request(self):
+        if not super().parse_request():
+            return False
+        if self.max_keep_alive_requests and self.requests_handled >= self.max_keep_alive_requests:
+            self.close_connection = True
+        elif getattr(self.server, "connections_waiting", 0):
+            # Every worker is busy: hand this one over to a queued connection
+            self.close_connection = True
+        return True
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "connection":
+            self.connection_header_sent = True
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        """Tell the client whether the connection stays open, unless already told"""
+        if not self.connection_header_sent:
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            else:
+                if self.request_version == "HTTP/1.0":
+                    self.send_header("Connection", "keep-alive")
+                keep_alive = f"timeout={self.keep_alive_timeout:g}"
+                if self.max_keep_alive_requests:
+                    keep_alive += f", max={self.max_keep_alive_requests - self.requests_handled}"
+                self.send_header("Keep-Alive", keep_alive)
+        super().end_headers()
+
+    def do_GET(self):
+        metrics = getattr(self.server, "metrics", None)
+        if metrics is not None and self.path.split("?", 1)[0] == METRICS_PATH:
+            self.send_metrics(metrics)
+            return
+        self.serve_tracked(super().do_GET)
+
+    def do_HEAD(self):
+        self.serve_tracked(super().do_HEAD)
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+
+    def log_request(self, code="-", size="-"):
+        access_log = getattr(self.server, "access_log", None)
+        if access_log is None:
+            super().log_request(code, size)
+        elif not getattr(self, "tracking", False) and isinstance(code, int):
+            # Requests served through serve_tracked() are logged once complete
+            access_log.log(request_record(self, code))
+
+    def log_message(self, format, *args):
+        access_log = getattr(self.server, "access_log", None)
+        if access_log is None:
+            super().log_message(format, *args)
+        else:
+            access_log.log({"client": self.client_address[0], "message": format % args})
+
+    def metrics_path(self):
+        """Metrics label: the existing file (or directory) the request resolved to, else "other"
+
+        translate_path() normalizes "..", so /windows/junk/../x.exe and
+        /windows/x.exe share one series.
+        """
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            return "/" + self.relative_path(path)
+        if os.path.isdir(path):
+            relative = self.relative_path(path)
+            return "/" if relative == "." else f"/{relative}/"
+        return "other"
+
+    def send_metrics(self, metrics):
+        transfers = getattr(self.server, "transfers", None)
+        body = metrics.render(len(transfers.active) if transfers else 0).encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_tracked(self, serve):
+        """Serve a request, then record it in the server's metrics and access log"""
+        self.response_status = None
+        self.bytes_sent = 0
+        self.tracking = True
+        started = time.perf_counter()
+        try:
+            self.serve_in_flight(serve)
+        finally:
+            self.tracking = False
+            seconds = time.perf_counter() - started
+            metrics = getattr(self.server, "metrics", None)
+            if metrics is not None:
+                metrics.observe(self.metrics_path(), self.command, self.response_status, self.bytes_sent, seconds)
+            access_log = getattr(self.server, "access_log", None)
+            if access_log is not None:
+                access_log.log(request_record(self, self.response_status, self.bytes_sent, seconds))
+
+    def serve_in_flight(self, serve):
+        """Apply the client's rate limits, then serve the request"""
+        rate_limiter = getattr(self.server, "rate_limiter", None)
+        if rate_limiter is not None:
+            retry_after = rate_limiter.admit(self.client_address[0])
+            if retry_after:
+                self.send_too_many_requests(retry_after)
+                return
+            if not rate_limiter.begin_transfer(self.client_address[0]):
+                self.send_too_many_requests(1)
+                return
+            try:
+                self.serve_admitted(serve)
+            finally:
+                rate_limiter.end_transfer(self.client_address[0])
+            return
+        self.serve_admitted(serve)
+
+    def send_too_many_requests(self, retry_after):
+        self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+        self.send_header("Retry-After", str(math.ceil(retry_after)))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def serve_admitted(self, serve):
+        """Serve a request while it is registered as in flight"""
+        transfers = getattr(self.server, "transfers", None)
+        if transfers is None:
+            serve()
+            return
+        token = transfers.begin(self)
+        if token is None:
+            self.close_connection = True
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, "Server is shutting down")
+            return
+        try:
+            serve()
+        except ConnectionError:
+            # A transfer cut off at the end of a drain has already been reported
+            if not transfers.draining:
+                raise
+            self.close_connection = True
+        finally:
+            transfers.end(token)
+            if transfers.draining:
+                self.close_connection = True
+
+    def send_head(self):
+        """Send headers for a GET/HEAD, honouring Range requests on regular files"""
+        self.byte_ranges = None
+        self.multipart_boundary = None
+        self.content_length = None
+        page = self.platform_index_page()
+        if page is not None:
+            return self.send_index_page(page)
+        path = self.translate_path(self.path)
+        trailing_slash = self.path.split("?", 1)[0].split("#", 1)[0].endswith("/")
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not trailing_slash or not os.path.isfile(index):
+                return super().send_head()
+            path = index
+        elif trailing_slash:
+            return super().send_head()
+        ctype = self.guess_type(path)
+        encoding, vary, path = self.negotiate_encoding(path)
+        try:
+            f, fs = self.open_file(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        try:
+            etag = self.etag_for(path, fs, f)
+            if self.is_not_modified(fs, etag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                if vary:
+                    self.send_header("Vary", "Accept-Encoding")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+                self.end_headers()
+                f.close()
+                return None
+            ranges = None
+            if "Range" in self.headers and self.if_range_matches(fs, etag):
+                ranges = parse_range_header(self.headers["Range"], fs.st_size)
+            if ranges == []:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{fs.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                f.close()
+                return None
+            if not ranges:
+                self.content_length = fs.st_size
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Length", str(fs.st_size))
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                self.byte_ranges = ranges
+                self.content_length = end - start + 1
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{fs.st_size}")
+                self.send_header("Content-Length", str(self.content_length))
+            else:
+                self.byte_ranges = ranges
+                self.multipart_boundary = uuid.uuid4().hex
+                self.part_headers = [
+                    (f"\r\n--{self.multipart_boundary}\r\n"
+                     f"Content-Type: {ctype}\r\n"
+                     f"Content-Range: bytes {start}-{end}/{fs.st_size}\r\n\r\n").encode("latin-1")
+                    for start, end in ranges
+                ]
+                self.part_trailer = f"\r\n--{self.multipart_boundary}--\r\n".encode("latin-1")
+                length = sum(len(h) for h in self.part_headers) + len(self.part_trailer)
+                length += sum(end - start + 1 for start, end in ranges)
+                self.content_length = length
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-type",
+                                 f"multipart/byteranges; boundary={self.multipart_boundary}")
+                self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if vary:
+                self.send_header("Vary", "Accept-Encoding")
+            if etag:
+                self.send_header("ETag", etag)
+            immutable_assets = getattr(self.server, "immutable_assets", None)
+            if immutable_assets is not None and self.relative_path(path) in immutable_assets:
+                self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+            self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+    def platform_index_page(self):
+        """The in-memory index page for /<platform>/, /<platform>/index.html or .json, if any"""
+        platform_indexes = getattr(self.server, "platform_indexes", None)
+        if platform_indexes is None:
+            return None
+        url_path = urllib.parse.unquote(self.path.split("?", 1)[0].split("#", 1)[0])
+        platform, _, name = url_path.lstrip("/").partition("/")
+        if platform not in PLATFORMS or url_path != f"/{platform}/{name}":
+            return None
+        name = name or "index.html"
+        if name not in PLATFORM_INDEX_FILES:
+            return None
+        return platform_indexes.get(platform, name)
+
+    def send_index_page(self, page):
+        """Send headers for an in-memory index page; returns its body as a file"""
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding", ""))
+        use_gzip = accepted.get("gzip", accepted.get("*", 0)) > 0
+        body, etag = (page.gzip_body, page.gzip_etag) if use_gzip else (page.body, page.etag)
+        if "If-None-Match" in self.headers and self.etag_matches(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-type", page.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
+        # Listings change whenever the tree does, so caches must revalidate
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def negotiate_encoding(self, path):
+        """Pick a precompressed sidecar for path from Accept-Encoding
+
+        Returns (content_coding or None, whether the response varies on
+        Accept-Encoding, path to serve).
+        """
+        if not path.lower().endswith(COMPRESSIBLE_SUFFIXES):
+            return None, False, path
+        try:
+            source_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, False, path
+        variants = []
+        for coding, suffix in SIDECAR_ENCODINGS:
+            try:
+                # A sidecar older than its source is stale and ignored
+                if os.stat(path + suffix).st_mtime_ns >= source_mtime:
+                    variants.append((coding, path + suffix))
+            except OSError:
+                pass
+        if not variants:
+            return None, False, path
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding", ""))
+        for coding, sidecar in variants:
+            if accepted.get(coding, accepted.get("*", 0)) > 0:
+                return coding, True, sidecar
+        return None, True, path
+
+    def open_file(self, path):
+        """Open path for reading, from the server's hot-file cache when it has one
+
+        Large files requested by Range are served from a shared mmap; other
+        uncached files are opened normally so the body can go out by sendfile().
+        """
+        cache = getattr(self.server, "file_cache", None)
+        mapped_files = getattr(self.server, "mapped_files", None)
+        fs = os.stat(path)
+        if cache is not None:
+            data = cache.get(path, fs)
+            if data is not None:
+                return io.BytesIO(data), fs
+        if (mapped_files is not None and "Range" in self.headers
+                and fs.st_size >= mapped_files.threshold):
+            return mapped_files.open(path, fs), fs
+        f = open(path, "rb")
+        fs = os.fstat(f.fileno())
+        if cache is not None and fs.st_size <= cache.max_file_bytes:
+            with f:
+                data = f.read()
+            cache.put(path, fs, data)
+            return io.BytesIO(data), fs
+        return f, fs
+
+    def etag_for(self, path, fs, f):
+        """Look up the file's ETag on the server's checksum index, if it has one"""
+        checksums = getattr(self.server, "checksums", None)
+        if checksums is None:
+            return None
+        return checksums.etag_for(self.relative_path(path), fs, f)
+
+    def relative_path(self, path):
+        """Path relative to the served directory, with forward slashes"""
+        return os.path.relpath(path, self.directory).replace(os.sep, "/")
+
+    def is_not_modified(self, fs, etag):
+        """Evaluate If-None-Match (which wins when present) or If-Modified-Since"""
+        if "If-None-Match" in self.headers:
+            return self.etag_matches(etag)
+        if "If-Modified-Since" not in self.headers:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers["If-Modified-Since"])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        last_modif = datetime.datetime.fromtimestamp(fs.st_mtime, datetime.timezone.utc)
+        return last_modif.replace(microsecond=0) <= ims
+
+    def etag_matches(self, etag):
+        """True if If-None-Match lists etag (weak comparison) or is *"""
+        if etag is None:
+            return False
+        candidates = [tag.strip() for tag in self.headers["If-None-Match"].split(",")]
+        return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+    def if_range_matches(self, fs, etag):
+        """A Range only applies if If-Range (when sent) still matches the file"""
+        if_range = self.headers.get("If-Range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(("\"", "W/")):
+            # If-Range needs a strong match, so weak tags never match
+            return etag is not None and if_range == etag
+        return if_range == self.date_time_string(fs.st_mtime)
+
+    def copyfile(self, source, outputfile):
+        """Copy a file body (or the requested byte ranges) to the client"""
+        sent = 0
+        if not self.byte_ranges:
+            sent += self.send_range(source, outputfile, 0, None)
+        elif self.multipart_boundary is None:
+            start, end = self.byte_ranges[0]
+            sent += self.send_range(source, outputfile, start, end - start + 1)
+        else:
+            for (start, end), part_header in zip(self.byte_ranges, self.part_headers):
+                outputfile.write(part_header)
+                sent += len(part_header)
+                sent += self.send_range(source, outputfile, start, end - start + 1)
+            outputfile.write(self.part_trailer)
+            sent += len(self.part_trailer)
+        self.bytes_sent += sent
+        if self.content_length is not None and sent != self.content_length:
+            # The file changed size mid-transfer; the client can't find
+            # the end of this response, so the connection can't be reused
+            self.close_connection = True
+
+    def send_range(self, source, outputfile, offset, count):
+        """copy_range(), paced in small chunks if the client's bandwidth is limited"""
+        rate_limiter = getattr(self.server, "rate_limiter", None)
+        if rate_limiter is None or not rate_limiter.bytes_per_second:
+            return self.copy_range(source, outputfile, offset, count)
+        if count is None:
+            source.seek(0, os.SEEK_END)
+            count = max(0, source.tell() - offset)
+        # About 20 chunks per second's allowance keeps the pacing smooth
+        chunk_size = max(1024, min(256 * 1024, rate_limiter.bytes_per_second // 20))
+        sent = 0
+        while sent < count:
+            chunk = min(chunk_size, count - sent)
+            delay = rate_limiter.throttle(self.client_address[0], chunk)
+            if delay:
+                time.sleep(delay)
+            copied = self.copy_range(source, outputfile, offset + sent, chunk)
+            if not copied:
+                break
+            sent += copied
+        return sent
+
+    def copy_range(self, source, outputfile, offset, count):
+        """Copy count bytes from offset (to EOF if count is None), zero-copy when possible
+
+        Returns the number of bytes sent.
+        """
+        if isinstance(source, MappedFile):
+            view = source.slice(offset, count)
+            for start in range(0, len(view), 1024 * 1024):
+                outputfile.write(view[start:start + 1024 * 1024])
+            return len(view)
+        if self.use_sendfile and outputfile is self.wfile:
+            try:
+                source.fileno()
+            except (AttributeError, OSError, ValueError):
+                pass
+            else:
+                return self.connection.sendfile(source, offset, count)
+        if count is None:
+            if offset:
+                source.seek(offset)
+            start = source.tell()
+            shutil.copyfileobj(source, outputfile)
+            return source.tell() - start
+        source.seek(offset)
+        remaining = count
+        while remaining > 0:
+            chunk = source.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+        return count - remaining
+
+class ThreadPoolTCPServer(socketserver.TCPServer):
+    """TCP server that hands each connection to a bounded worker pool
+
+    At most backlog accepted connections wait for a worker; beyond that a
+    connection gets an immediate 503 instead of queueing in memory.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler, max_workers=None, backlog=128):
+        # request_queue_size is read by server_activate() for listen()
+        self.request_queue_size = backlog
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix="download-worker")
+        # Accepted connections still waiting for a worker
+        self.connections_waiting = 0
+        self.waiting_lock = threading.Lock()
+        super().__init__(server_address, handler)
+
+    def process_request(self, request, client_address):
+        """Queue the connection on the pool instead of handling it inline"""
+        with self.waiting_lock:
+            queue_full = self.connections_waiting >= self.request_queue_size
+            if not queue_full:
+                self.connections_waiting += 1
+        if queue_full:
+            self.reject_request(request)
+            return
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def reject_request(self, request):
+        """Answer 503 without reading the request, then close the connection"""
+        try:
+            # Small enough to fit in a fresh socket's send buffer
+            request.settimeout(1)
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                            b"Retry-After: 1\r\n"
+                            b"Content-Length: 0\r\n"
+                            b"Connection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def process_request_thread(self, request, client_address):
+        with self.waiting_lock:
+            self.connections_waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
 
 class DownloadServer:
-    def __init__(self, port=8000):
+    def __init__(self, port=8000, mode="threaded", max_workers=None, backlog=128,
+                 cache_bytes=64 * 1024 * 1024, mmap_threshold=32 * 1024 * 1024,
+                 access_log="access.log", log_sample_rate=1.0,
+                 requests_per_second=None, request_burst=None, bytes_per_second=None,
+                 transfers_per_client=None, keep_alive_timeout=5, max_keep_alive_requests=100):
+        if mode not in SERVER_MODES:
+            raise ValueError(f"Unknown server mode: {mode} (expected one of {SERVER_MODES})")
         self.port = port
+        self.mode = mode
+        self.max_workers = max_workers
+        self.backlog = backlog
+        self.cache_bytes = cache_bytes
+        self.file_cache = HotFileCache(cache_bytes) if cache_bytes else None
+        self.mapped_files = MappedFileRegistry(mmap_threshold) if mmap_threshold else None
         self.downloads_dir = Path("downloads")
+        self.metrics = ServerMetrics()
+        # JSON-lines request log, kept outside downloads_dir so it isn't served;
+        # None logs to stderr like SimpleHTTPRequestHandler
+        self.access_log_path = access_log
+        self.log_sample_rate = log_sample_rate
+        self.access_log = None
+        # Per-client-IP limits; None leaves that dimension unlimited
+        self.rate_limiter = None
+        if requests_per_second or bytes_per_second:
+            self.rate_limiter = ClientRateLimiter(requests_per_second, request_burst, bytes_per_second,
+                                                  max_transfers=transfers_per_client)
+        # Idle kept-alive connections hold a worker thread, so they are
+        # closed after keep_alive_timeout seconds; None/0 lifts the request cap
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests
         self.server = None
+        self.thread = None
+
+    def create_server(self, handler):
+        """Create the socket server for the configured mode"""
+        if self.mode == "threaded":
+            return ThreadPoolTCPServer(("", self.port), handler,
+                                       max_workers=self.max_workers, backlog=self.backlog)
+        return socketserver.TCPServer(("", self.port), handler)
+        
+    def create_httpd(self, directory=None):
+        """Create the server for directory (default: the current one), with its shared state attached"""
+        directory = os.path.abspath(directory or os.getcwd())
+        httpd = self.create_server(functools.partial(DownloadRequestHandler, directory=directory))
+        httpd.checksums = ChecksumIndex(directory)
+        httpd.immutable_assets = ImmutableAssets(directory)
+        httpd.platform_indexes = PlatformIndexes(directory, httpd.checksums)
+        httpd.file_cache = self.file_cache
+        httpd.mapped_files = self.mapped_files
+        httpd.transfers = TransferTracker()
+        httpd.metrics = self.metrics
+        httpd.rate_limiter = self.rate_limiter
+        httpd.keep_alive_timeout = self.keep_alive_timeout
+        # A single-threaded server would serve nobody else while a
+        # connection sat idle, so it closes each one after its request
+        httpd.max_keep_alive_requests = 1 if self.mode == "single" else self.max_keep_alive_requests
+        return httpd
+        
+    def start(self):
+        """Start serving downloads_dir in a background thread; returns the bound port"""
+        if self.server:
+            raise RuntimeError("Server is already running")
+        self.server = self.create_httpd(self.downloads_dir)
+        if self.access_log_path:
+            self.access_log = AccessLog(self.access_log_path, sample_rate=self.log_sample_rate).start()
+            self.server.access_log = self.access_log
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name="download-server", daemon=True)
+        self.thread.start()
+        return self.server.server_address[1]
+        
+    def drain(self, timeout=30):
+        """Stop accepting connections and give in-flight transfers up to timeout seconds
+        
+        Requests arriving on existing connections get a 503. Transfers
+        still running at the deadline are cut off and returned.
+        """
+        httpd = self.server
+        if not httpd:
+            return []
+        deadline = time.monotonic() + timeout
+        httpd.transfers.start_draining()
+        
+        # Shutting down the listening socket refuses new connections at
+        # once; serve_forever() itself only notices within its poll interval
+        try:
+            httpd.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        httpd.socket.close()
+        # Kept-alive connections between requests would otherwise sit out
+        # their idle timeout; busy ones close once their request is done
+        httpd.transfers.close_idle()
+        # In single mode serve_forever() returns only after the request it
+        # is serving, so shutdown() is waited for off-thread
+        stopper = threading.Thread(target=httpd.shutdown, daemon=True)
+        stopper.start()
+        
+        interrupted = []
+        if not httpd.transfers.wait_idle(max(0.0, deadline - time.monotonic())):
+            interrupted = httpd.transfers.interrupt_all()
+        stopper.join()
+        
+        if interrupted:
+            print(f"⚠️ Interrupted {len(interrupted)} transfer(s) still running after {timeout}s:")
+            for transfer in interrupted:
+                print(f"   {transfer['client']} \"{transfer['request']}\" ({transfer['seconds']}s)")
+        else:
+            print("✅ All in-flight transfers finished")
+        return interrupted
+        
+    def stop(self, timeout=30):
+        """Drain, then release the server; returns the interrupted transfers"""
+        if not self.server:
+            return []
+        interrupted = self.drain(timeout)
+        self.server.server_close()
+        self.thread.join()
+        self.server = None
+        self.thread = None
+        if self.access_log:
+            self.access_log.close()
+            if self.access_log.dropped:
+                print(f"⚠️ Access log dropped {self.access_log.dropped} records (queue full)")
+            self.access_log = None
+        return interrupted
         
     def start_server(self):
-        """Start the local download server"""
+        """Start the local download server (blocks until Ctrl+C)"""
         print(f"🚀 Starting local download server on port {self.port}...")
         
-        # Change to downloads directory
-        os.chdir(self.downloads_dir)
+        try:
+            port = self.start()
+        except Exception as e:
+            print(f"❌ Error starting server: {e}")
+            return
+        
+        print(f"✅ Server started successfully!")
+        if self.mode == "threaded":
+            print(f"🧵 Thread pool: {self.server.max_workers} workers, backlog {self.backlog}")
+        print(f"🔁 Keep-alive: {self.keep_alive_timeout}s idle timeout, "
+              f"{self.max_keep_alive_requests or 'unlimited'} requests per connection")
+        print(f"📁 Serving files from: {self.downloads_dir.absolute()}")
+        print(f"🌐 Server URL: http://localhost:{port}")
+        print(f"📥 Download URLs:")
+        print(f"   Windows: http://localhost:{port}/windows/akan-wise-saying-windows.exe")
+        print(f"   macOS: http://localhost:{port}/mac/akan-wise-saying-mac.dmg")
+        print(f"   Linux: http://localhost:{port}/linux/akan-wise-saying-linux.AppImage")
+        print(f"📊 Metrics: http://localhost:{port}{METRICS_PATH}")
+        if self.rate_limiter:
+            limiter = self.rate_limiter
+            print(f"🚦 Per-client limits: {limiter.requests_per_second or 'unlimited'} req/s, "
+                  f"{f'{limiter.bytes_per_second / 1024:.0f} KB/s' if limiter.bytes_per_second else 'unlimited bandwidth'}"
+                  f"{f', {limiter.max_transfers} transfers at once' if limiter.max_transfers else ''}")
+        if self.access_log:
+            print(f"📝 Access log: {self.access_log.path.absolute()}")
+        print(f"\n🔄 Server is running... Press Ctrl+C to stop")
         
-        # Create HTTP server
-        handler = http.server.SimpleHTTPRequestHandler
+        # Open browser to show available files
+        webbrowser.open(f"http://localhost:{port}")
         
         try:
-            with socketserver.TCPServer(("", self.port), handler) as httpd:
-                self.server = httpd
-                print(f"✅ Server started successfully!")
-                print(f"📁 Serving files from: {self.downloads_dir.absolute()}")
-                print(f"🌐 Server URL: http://localhost:{self.port}")
-                print(f"📥 Download URLs:")
-                print(f"   Windows: http://localhost:{self.port}/windows/akan-wise-saying-windows.exe")
-                print(f"   macOS: http://localhost:{self.port}/mac/akan-wise-saying-mac.dmg")
-                print(f"   Linux: http://localhost:{self.port}/linux/akan-wise-saying-linux.AppImage")
-                print(f"\n🔄 Server is running... Press Ctrl+C to stop")
-                
-                # Open browser to show available files
-                webbrowser.open(f"http://localhost:{self.port}")
-                
-                # Start server
-                httpd.serve_forever()
-                
+            while self.thread.is_alive():
+                self.thread.join(0.5)
         except KeyboardInterrupt:
-            print(f"\n🛑 Server stopped by user")
-        except Exception as e:
-            print(f"❌ Error starting server: {e}")
+            print(f"\n🛑 Server stopped by user, finishing in-flight downloads...")
+            self.stop_server()
             
-    def stop_server(self):
-        """Stop the server"""
+    def stop_server(self, timeout=30):
+        """Stop the server, letting in-flight downloads finish for up to timeout seconds"""
         if self.server:
-            self.server.shutdown()
+            self.stop(timeout)
             print("🛑 Server stopped")
+            if self.file_cache:
+                stats = self.file_cache.stats()
+                print(f"📊 Cache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['evictions']} evictions")
 
 def update_app_store_urls():
     """Update the app store to use local server URLs"""
@@ -182,12 +1554,29 @@ def create_download_page():
 </body>
 </html>"""
     
-    with open("downloads/index.html", "w", encoding="utf-8") as f:
-        f.write(download_page)
+    replace_file("downloads/index.html", download_page.encode("utf-8"))
+    
+    write_compressed_sidecars("downloads/index.html")
     
     print("✅ Created download page at downloads/index.html")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Cosmic App Store downloads locally")
+    parser.add_argument('--requests-per-second', type=float,
+                        help="per-client request rate; excess requests get 429 + Retry-After")
+    parser.add_argument('--request-burst', type=int,
+                        help="requests a client may make at once (default: one second's worth)")
+    parser.add_argument('--bytes-per-second', type=int,
+                        help="per-client bandwidth; faster transfers are paced down to it")
+    parser.add_argument('--transfers-per-client', type=int,
+                        help="requests a bandwidth-limited client may have in flight; "
+                             "excess requests get 429 (default: 2)")
+    parser.add_argument('--keep-alive-timeout', type=float, default=5,
+                        help="seconds an idle connection is kept open for its next request (default: 5)")
+    parser.add_argument('--max-keep-alive-requests', type=int, default=100,
+                        help="requests served per connection before it is closed (default: 100, 0 = no limit)")
+    args = parser.parse_args()
+    
     print("🌟 Cosmic App Store - Local Download Server")
     print("=" * 50)
     
@@ -198,5 +1587,9 @@ if __name__ == "__main__":
     update_app_store_urls()
     
     # Start server
-    server = DownloadServer(port=8000)
+    server = DownloadServer(port=8000, requests_per_second=args.requests_per_second,
+                            request_burst=args.request_burst, bytes_per_second=args.bytes_per_second,
+                            transfers_per_client=args.transfers_per_client,
+                            keep_alive_timeout=args.keep_alive_timeout,
+                            max_keep_alive_requests=args.max_keep_alive_requests)
     server.start_server() 
\ No newline at end of file
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test npm Install Fingerprinting for Cosmic App Store
+Runs the Electron build against a fake npm on PATH and checks install is skipped when unchanged
+"""
+
+import contextlib
+import io
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+from akan_executable_generator import AkanExecutableGenerator
+
+# Logs each npm command line, and fakes what install and the builds leave behind
+FAKE_NPM = """#!/bin/sh
+echo "$*" >> "$FAKE_NPM_LOG"
+case "$1" in
+    install) mkdir -p node_modules ;;
+    run) mkdir -p dist && touch "dist/$2.exe" "dist/$2.dmg" "dist/$2.AppImage" ;;
+esac
+"""
+
+FAKE_NODE = """#!/bin/sh
+echo v20.0.0
+"""
+
+def write_stub(bin_dir, name, script):
+    path = bin_dir / name
+    path.write_text(script)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+def npm_installs(log_file):
+    """How many times the fake npm was asked to install"""
+    if not log_file.exists():
+        return 0
+    return sum(1 for line in log_file.read_text().splitlines() if line.split()[:1] == ["install"])
+
+def build(generator):
+    """Run build_executables quietly; returns its result"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generator.build_executables()
+
+def test_second_build_skips_npm_install():
+    """The first build installs, an unchanged rebuild skips, a package.json change reinstalls"""
+    if os.name != "posix":
+        print("⏭️ Skipped: the fake npm is a shell script")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        bin_dir = tmp / "bin"
+        bin_dir.mkdir()
+        write_stub(bin_dir, "npm", FAKE_NPM)
+        write_stub(bin_dir, "node", FAKE_NODE)
+        log_file = tmp / "npm.log"
+
+        generator = AkanExecutableGenerator()
+        generator.akan_dir = tmp / "app"
+        generator.downloads_dir = tmp / "downloads"
+        generator.akan_dir.mkdir()
+        for platform in ("windows", "mac", "linux"):
+            (generator.downloads_dir / platform).mkdir(parents=True)
+        generator.create_package_json()
+
+        saved_env = {name: os.environ.get(name) for name in ("PATH", "FAKE_NPM_LOG")}
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        os.environ["FAKE_NPM_LOG"] = str(log_file)
+        try:
+            assert build(generator), "first build failed"
+            assert npm_installs(log_file) == 1, "first build should run npm install"
+            print("✅ First build ran npm install")
+
+            assert build(generator), "second build failed"
+            assert npm_installs(log_file) == 1, "unchanged rebuild should skip npm install"
+            print("✅ Unchanged rebuild skipped npm install")
+
+            package_json = generator.akan_dir / "package.json"
+            package_json.write_text(package_json.read_text().replace('"1.0.0"', '"1.0.1"', 1))
+            assert build(generator), "third build failed"
+            assert npm_installs(log_file) == 2, "a package.json change should reinstall"
+            print("✅ Changed package.json triggered a reinstall")
+
+            assert (generator.downloads_dir / "windows" / f"{generator.app_id}-windows.exe").exists()
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+if __name__ == "__main__":
+    print("🌟 Cosmic App Store - npm Install Fingerprint Test")
+    print("=" * 50)
+
+    test_second_build_skips_npm_install()
+
+    print("\n🎉 Test complete!")